@@ -8,9 +8,12 @@ Clean WSD UI with Dark/Light Mode Toggle
 
 import os
 import re
+import hashlib
+from dataclasses import dataclass
 import torch
 import pandas as pd
 import streamlit as st
+import streamlit.components.v1 as components
 from transformers import BertTokenizerFast, BertForSequenceClassification
 
 import nltk
@@ -18,14 +21,19 @@ from nltk.corpus import wordnet as wn
 
 # Wikipedia integration for named entities
 try:
-    import wikipedia_knowledge
-    import importlib
-    importlib.reload(wikipedia_knowledge) # FORCE RELOAD to fix hanging issue
     from wikipedia_knowledge import get_wikipedia_summary, get_disambiguation_candidates
     WIKIPEDIA_AVAILABLE = True
 except ImportError:
     WIKIPEDIA_AVAILABLE = False
 
+# Optional ONNX Runtime backend for BERT scoring
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic as quantize_onnx_dynamic
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
 # Ensure resources
 nltk.download('wordnet', quiet=True)
 nltk.download('omw-1.4', quiet=True)
@@ -39,451 +47,571 @@ st.set_page_config(
 
 # ---------------- CONFIG ----------------
 MODEL_DIR = "bert-base-uncased"  # HuggingFace model for cloud deployment
-MAX_LEN = 128
+MAX_LEN = 128  # Truncation cap only; batches are padded to their longest pair
 TOP_K = 6
 ALPHA = 0.6
+NUM_LABELS = 2  # Binary classification (match/no-match)
+CUDA_MEMORY_FRACTION = 0.8       # Cap on this process's share of GPU memory
+CUDA_EMPTY_CACHE_FRACTION = 0.5  # Release cached blocks once reserved memory exceeds this share
 
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 
 
-# ---------------- THEME STATE ----------------
-if "dark_mode" not in st.session_state:
-    st.session_state.dark_mode = False
-
-def toggle_theme():
-    st.session_state.dark_mode = not st.session_state.dark_mode
-
-# ---------------- APPLY THEME CSS ----------------
-if st.session_state.dark_mode:
-    # DARK MODE CSS
-    st.markdown("""
-    <style>
-    /* Dark theme */
-    .stApp, [data-testid="stAppViewContainer"], [data-testid="stHeader"], 
-    [data-testid="stToolbar"], [data-testid="stDecoration"], 
-    [data-testid="stStatusWidget"], .main, .block-container {
-        background-color: #1a1a2e !important;
-    }
-
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-
-    /* ALL TEXT WHITE */
-    *, p, span, div, label, h2, h3, h4, h5, h6 {
-        color: #ffffff !important;
-        font-size: 1.1rem;
-    }
-
-    .main-title {
-        font-size: 5rem !important;
-        font-weight: 800 !important;
-        color: #60a5fa !important;
-        margin-bottom: 0.5rem !important;
-    }
-
-    .subtitle {
-        font-size: 1.2rem !important;
-        color: #9ca3af !important;
-        margin-bottom: 1rem;
-    }
-
-    /* Text area */
-    .stTextArea textarea {
-        background-color: #2d2d44 !important;
-        border: 2px solid #4b5563 !important;
-        border-radius: 8px !important;
-        color: #ffffff !important;
-        font-size: 1.2rem !important;
-        caret-color: #ffffff !important;
-        padding: 12px !important;
-    }
-
-    .stTextArea textarea:focus {
-        border-color: #60a5fa !important;
-    }
-
-    /* Select box */
-    .stSelectbox > div > div {
-        background-color: #2d2d44 !important;
-        border: 2px solid #4b5563 !important;
-        border-radius: 8px !important;
-    }
-
-    .stSelectbox > div > div > div {
-        color: #ffffff !important;
-        font-size: 1.2rem !important;
-    }
-
-    /* Dropdown */
-    [data-baseweb="popover"], [data-baseweb="menu"], [role="listbox"] {
-        background-color: #2d2d44 !important;
-    }
-
-    [data-baseweb="menu"] li, [role="option"] {
-        background-color: #2d2d44 !important;
-        color: #ffffff !important;
-    }
-
-    [data-baseweb="menu"] li:hover, [role="option"]:hover {
-        background-color: #3d3d5c !important;
-    }
-
-    div[data-baseweb="select"] span {
-        color: #ffffff !important;
-    }
-
-    /* Highlighted word */
-    .highlight-word {
-        background-color: #3b82f6;
-        color: #ffffff !important;
-        padding: 6px 14px;
-        border-radius: 6px;
-        font-weight: 700;
-        font-size: 1.3rem !important;
-        display: inline-block;
-        margin: 4px;
-    }
-
-    .normal-word {
-        color: #e5e7eb !important;
-        display: inline-block;
-        margin: 4px;
-        padding: 6px 6px;
-        font-size: 1.3rem !important;
-    }
-
-    /* Buttons */
-    .stButton > button {
-        background-color: #3b82f6 !important;
-        border: none !important;
-        border-radius: 8px !important;
-        padding: 12px 24px !important;
-        font-weight: 700 !important;
-        font-size: 1.2rem !important;
-        width: 100% !important;
-        white-space: nowrap !important;
-    }
-
-    .stButton > button, .stButton > button *, .stButton > button span {
-        color: #ffffff !important;
-    }
-
-    .stButton > button:hover {
-        background-color: #2563eb !important;
-    }
-
-    /* Result box */
-    .result-box {
-        background-color: #1e3a5f;
-        border: 2px solid #3b82f6;
-        border-radius: 12px;
-        padding: 20px;
-        margin: 16px 0;
-    }
-
-    .result-title {
-        color: #60a5fa !important;
-        font-size: 1.5rem !important;
-        font-weight: 700;
-        margin-bottom: 8px;
-    }
-
-    .result-def {
-        color: #e5e7eb !important;
-        font-size: 1.2rem !important;
-        line-height: 1.6;
-    }
-
-    /* Candidate item */
-    .candidate-item {
-        background-color: #2d2d44;
-        border: 2px solid #4b5563;
-        border-radius: 10px;
-        padding: 16px;
-        margin: 10px 0;
-    }
-
-    .candidate-item:hover {
-        border-color: #3b82f6;
-        background-color: #3d3d5c;
-    }
-
-    .candidate-name {
-        color: #60a5fa !important;
-        font-weight: 700;
-        font-size: 1.2rem !important;
-    }
-
-    .candidate-def {
-        color: #d1d5db !important;
-        font-size: 1.1rem !important;
-        margin-top: 6px;
-    }
-
-    .score-badge {
-        display: inline-block;
-        background-color: #3d3d5c;
-        padding: 5px 10px;
-        border-radius: 6px;
-        margin-right: 8px;
-        font-size: 1rem !important;
-        color: #e5e7eb !important;
-        font-weight: 600;
-    }
-
-    .section-divider {
-        border-top: 2px solid #4b5563;
-        margin: 20px 0;
-    }
-
-    /* Theme toggle button */
-    .theme-toggle {
-        position: fixed;
-        top: 20px;
-        right: 20px;
-        z-index: 999;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-else:
-    # LIGHT MODE CSS
-    st.markdown("""
-    <style>
-    /* Light theme */
-    .stApp, [data-testid="stAppViewContainer"], [data-testid="stHeader"], 
-    [data-testid="stToolbar"], [data-testid="stDecoration"], 
-    [data-testid="stStatusWidget"], .main, .block-container {
-        background-color: #ffffff !important;
-    }
-
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-
-    /* ALL TEXT BLACK */
-    *, p, span, div, label, h2, h3, h4, h5, h6 {
-        color: #000000 !important;
-        font-size: 1.1rem;
-    }
-
-    .main-title {
-        font-size: 5rem !important;
-        font-weight: 800 !important;
-        color: #1e40af !important;
-        margin-bottom: 0.5rem !important;
-    }
-
-    .subtitle {
-        font-size: 1.2rem !important;
-        color: #374151 !important;
-        margin-bottom: 1rem;
-    }
-
-    /* Text area */
-    .stTextArea textarea {
-        background-color: #ffffff !important;
-        border: 2px solid #d1d5db !important;
-        border-radius: 8px !important;
-        color: #000000 !important;
-        font-size: 1.2rem !important;
-        caret-color: #000000 !important;
-        padding: 12px !important;
-    }
-
-    .stTextArea textarea:focus {
-        border-color: #2563eb !important;
-    }
-
-    /* Select box */
-    .stSelectbox > div > div {
-        background-color: #ffffff !important;
-        border: 2px solid #d1d5db !important;
-        border-radius: 8px !important;
-    }
-
-    .stSelectbox > div > div > div {
-        color: #000000 !important;
-        font-size: 1.2rem !important;
-    }
-
-    /* Dropdown */
-    [data-baseweb="popover"], [data-baseweb="menu"], [role="listbox"] {
-        background-color: #ffffff !important;
-    }
-
-    [data-baseweb="menu"] li, [role="option"] {
-        background-color: #ffffff !important;
-        color: #000000 !important;
-    }
-
-    [data-baseweb="menu"] li:hover, [role="option"]:hover {
-        background-color: #e5e7eb !important;
-    }
-
-    div[data-baseweb="select"] span {
-        color: #000000 !important;
-    }
-
-    /* Highlighted word */
-    .highlight-word {
+# ---------------- THEME CSS ----------------
+# Both themes share one stylesheet driven by CSS variables. The toggle button
+# swaps data-theme on the page root client-side, so switching themes does not
+# trigger a Streamlit rerun.
+st.markdown("""
+<style>
+:root {
+    --wsd-bg: #ffffff;
+    --wsd-text: #000000;
+    --wsd-title: #1e40af;
+    --wsd-subtitle: #374151;
+    --wsd-input-bg: #ffffff;
+    --wsd-input-border: #d1d5db;
+    --wsd-focus: #2563eb;
+    --wsd-menu-hover: #e5e7eb;
+    --wsd-highlight: #2563eb;
+    --wsd-word: #000000;
+    --wsd-button: #2563eb;
+    --wsd-button-hover: #1d4ed8;
+    --wsd-result-bg: #dbeafe;
+    --wsd-result-border: #93c5fd;
+    --wsd-result-def: #000000;
+    --wsd-card-bg: #f9fafb;
+    --wsd-card-border: #e5e7eb;
+    --wsd-card-hover-border: #2563eb;
+    --wsd-card-hover-bg: #eff6ff;
+    --wsd-card-def: #000000;
+    --wsd-badge-bg: #e5e7eb;
+    --wsd-badge-text: #000000;
+    --wsd-divider: #e5e7eb;
+}
+
+:root[data-theme="dark"] {
+    --wsd-bg: #1a1a2e;
+    --wsd-text: #ffffff;
+    --wsd-title: #60a5fa;
+    --wsd-subtitle: #9ca3af;
+    --wsd-input-bg: #2d2d44;
+    --wsd-input-border: #4b5563;
+    --wsd-focus: #60a5fa;
+    --wsd-menu-hover: #3d3d5c;
+    --wsd-highlight: #3b82f6;
+    --wsd-word: #e5e7eb;
+    --wsd-button: #3b82f6;
+    --wsd-button-hover: #2563eb;
+    --wsd-result-bg: #1e3a5f;
+    --wsd-result-border: #3b82f6;
+    --wsd-result-def: #e5e7eb;
+    --wsd-card-bg: #2d2d44;
+    --wsd-card-border: #4b5563;
+    --wsd-card-hover-border: #3b82f6;
+    --wsd-card-hover-bg: #3d3d5c;
+    --wsd-card-def: #d1d5db;
+    --wsd-badge-bg: #3d3d5c;
+    --wsd-badge-text: #e5e7eb;
+    --wsd-divider: #4b5563;
+}
+
+.stApp, [data-testid="stAppViewContainer"], [data-testid="stHeader"], 
+[data-testid="stToolbar"], [data-testid="stDecoration"], 
+[data-testid="stStatusWidget"], .main, .block-container {
+    background-color: var(--wsd-bg) !important;
+}
+
+/* Hide Streamlit branding */
+#MainMenu {visibility: hidden;}
+footer {visibility: hidden;}
+header {visibility: hidden;}
+
+/* ALL TEXT in the theme's text color */
+*, p, span, div, label, h2, h3, h4, h5, h6 {
+    color: var(--wsd-text) !important;
+    font-size: 1.1rem;
+}
+
+.main-title {
+    font-size: 5rem !important;
+    font-weight: 800 !important;
+    color: var(--wsd-title) !important;
+    margin-bottom: 0.5rem !important;
+}
+
+.subtitle {
+    font-size: 1.2rem !important;
+    color: var(--wsd-subtitle) !important;
+    margin-bottom: 1rem;
+}
+
+/* Text area */
+.stTextArea textarea {
+    background-color: var(--wsd-input-bg) !important;
+    border: 2px solid var(--wsd-input-border) !important;
+    border-radius: 8px !important;
+    color: var(--wsd-text) !important;
+    font-size: 1.2rem !important;
+    caret-color: var(--wsd-text) !important;
+    padding: 12px !important;
+}
+
+.stTextArea textarea:focus {
+    border-color: var(--wsd-focus) !important;
+}
+
+/* Select box */
+.stSelectbox > div > div {
+    background-color: var(--wsd-input-bg) !important;
+    border: 2px solid var(--wsd-input-border) !important;
+    border-radius: 8px !important;
+}
+
+.stSelectbox > div > div > div {
+    color: var(--wsd-text) !important;
+    font-size: 1.2rem !important;
+}
+
+/* Dropdown */
+[data-baseweb="popover"], [data-baseweb="menu"], [role="listbox"] {
+    background-color: var(--wsd-input-bg) !important;
+}
+
+[data-baseweb="menu"] li, [role="option"] {
+    background-color: var(--wsd-input-bg) !important;
+    color: var(--wsd-text) !important;
+}
+
+[data-baseweb="menu"] li:hover, [role="option"]:hover {
+    background-color: var(--wsd-menu-hover) !important;
+}
+
+div[data-baseweb="select"] span {
+    color: var(--wsd-text) !important;
+}
+
+/* Highlighted word */
+.highlight-word {
+    background-color: var(--wsd-highlight);
+    color: #ffffff !important;
+    padding: 6px 14px;
+    border-radius: 6px;
+    font-weight: 700;
+    font-size: 1.3rem !important;
+    display: inline-block;
+    margin: 4px;
+}
+
+.normal-word {
+    color: var(--wsd-word) !important;
+    display: inline-block;
+    margin: 4px;
+    padding: 6px 6px;
+    font-size: 1.3rem !important;
+}
+
+/* Buttons */
+.stButton > button {
+    background-color: var(--wsd-button) !important;
+    border: none !important;
+    border-radius: 8px !important;
+    padding: 12px 24px !important;
+    font-weight: 700 !important;
+    font-size: 1.2rem !important;
+    width: 100% !important;
+    white-space: nowrap !important;
+}
+
+.stButton > button, .stButton > button *, .stButton > button span {
+    color: #ffffff !important;
+}
+
+.stButton > button:hover {
+    background-color: var(--wsd-button-hover) !important;
+}
+
+/* Result box */
+.result-box {
+    background-color: var(--wsd-result-bg);
+    border: 2px solid var(--wsd-result-border);
+    border-radius: 12px;
+    padding: 20px;
+    margin: 16px 0;
+}
+
+.result-title {
+    color: var(--wsd-title) !important;
+    font-size: 1.5rem !important;
+    font-weight: 700;
+    margin-bottom: 8px;
+}
+
+.result-def {
+    color: var(--wsd-result-def) !important;
+    font-size: 1.2rem !important;
+    line-height: 1.6;
+}
+
+/* Candidate item */
+.candidate-item {
+    background-color: var(--wsd-card-bg);
+    border: 2px solid var(--wsd-card-border);
+    border-radius: 10px;
+    padding: 16px;
+    margin: 10px 0;
+}
+
+.candidate-item:hover {
+    border-color: var(--wsd-card-hover-border);
+    background-color: var(--wsd-card-hover-bg);
+}
+
+.candidate-name {
+    color: var(--wsd-title) !important;
+    font-weight: 700;
+    font-size: 1.2rem !important;
+}
+
+.candidate-def {
+    color: var(--wsd-card-def) !important;
+    font-size: 1.1rem !important;
+    margin-top: 6px;
+}
+
+.score-badge {
+    display: inline-block;
+    background-color: var(--wsd-badge-bg);
+    padding: 5px 10px;
+    border-radius: 6px;
+    margin-right: 8px;
+    font-size: 1rem !important;
+    color: var(--wsd-badge-text) !important;
+    font-weight: 600;
+}
+
+.section-divider {
+    border-top: 2px solid var(--wsd-divider);
+    margin: 20px 0;
+}
+</style>
+""", unsafe_allow_html=True)
+
+# Toggle button rendered in a component iframe; it flips data-theme on the
+# parent page and remembers the choice in localStorage.
+THEME_TOGGLE_HTML = """
+<style>
+    html, body { margin: 0; background: transparent; }
+    #theme-toggle {
+        width: 100%;
+        padding: 12px 24px;
+        border: none;
+        border-radius: 8px;
         background-color: #2563eb;
-        color: #ffffff !important;
-        padding: 6px 14px;
-        border-radius: 6px;
-        font-weight: 700;
-        font-size: 1.3rem !important;
-        display: inline-block;
-        margin: 4px;
-    }
-
-    .normal-word {
-        color: #000000 !important;
-        display: inline-block;
-        margin: 4px;
-        padding: 6px 6px;
-        font-size: 1.3rem !important;
-    }
-
-    /* Buttons */
-    .stButton > button {
-        background-color: #2563eb !important;
-        border: none !important;
-        border-radius: 8px !important;
-        padding: 12px 24px !important;
-        font-weight: 700 !important;
-        font-size: 1.2rem !important;
-        width: 100% !important;
-        white-space: nowrap !important;
-    }
-
-    .stButton > button, .stButton > button *, .stButton > button span {
-        color: #ffffff !important;
-    }
-
-    .stButton > button:hover {
-        background-color: #1d4ed8 !important;
-    }
-
-    /* Result box */
-    .result-box {
-        background-color: #dbeafe;
-        border: 2px solid #93c5fd;
-        border-radius: 12px;
-        padding: 20px;
-        margin: 16px 0;
-    }
-
-    .result-title {
-        color: #1e40af !important;
-        font-size: 1.5rem !important;
-        font-weight: 700;
-        margin-bottom: 8px;
-    }
-
-    .result-def {
-        color: #000000 !important;
-        font-size: 1.2rem !important;
-        line-height: 1.6;
-    }
-
-    /* Candidate item */
-    .candidate-item {
-        background-color: #f9fafb;
-        border: 2px solid #e5e7eb;
-        border-radius: 10px;
-        padding: 16px;
-        margin: 10px 0;
-    }
-
-    .candidate-item:hover {
-        border-color: #2563eb;
-        background-color: #eff6ff;
-    }
+        color: #ffffff;
+        font: 700 1.2rem "Source Sans Pro", sans-serif;
+        white-space: nowrap;
+        cursor: pointer;
+    }
+    #theme-toggle:hover { background-color: #1d4ed8; }
+    #theme-toggle.dark { background-color: #3b82f6; }
+    #theme-toggle.dark:hover { background-color: #2563eb; }
+</style>
+<button id="theme-toggle" type="button"></button>
+<script>
+    const root = window.parent.document.documentElement;
+    const store = window.parent.localStorage;
+    const button = document.getElementById("theme-toggle");
+
+    function applyTheme(theme) {
+        root.setAttribute("data-theme", theme);
+        store.setItem("wsd-theme", theme);
+        button.textContent = theme === "dark" ? "Light Mode" : "Dark Mode";
+        button.classList.toggle("dark", theme === "dark");
+    }
+
+    applyTheme(store.getItem("wsd-theme") || "light");
+    button.addEventListener("click", () => {
+        applyTheme(root.getAttribute("data-theme") === "dark" ? "light" : "dark");
+    });
+</script>
+"""
 
-    .candidate-name {
-        color: #1e40af !important;
-        font-weight: 700;
-        font-size: 1.2rem !important;
-    }
+# ---------------- LOAD MODEL ----------------
+def select_backend():
+    """
+    Pick the one backend that serves BERT scoring on this device.
+    ONNX Runtime is used on GPU only if its CUDA provider is installed (the CPU-only
+    wheel would silently run on the CPU); otherwise PyTorch serves GPU requests.
+    """
+    if not ONNX_AVAILABLE:
+        return "torch"
+    if device.type == "cuda":
+        return "onnx" if "CUDAExecutionProvider" in ort.get_available_providers() else "torch"
+    return "onnx"
 
-    .candidate-def {
-        color: #000000 !important;
-        font-size: 1.1rem !important;
-        margin-top: 6px;
-    }
+BACKEND = select_backend()
 
-    .score-badge {
-        display: inline-block;
-        background-color: #e5e7eb;
-        padding: 5px 10px;
-        border-radius: 6px;
-        margin-right: 8px;
-        font-size: 1rem !important;
-        color: #000000 !important;
-        font-weight: 600;
-    }
+def onnx_export_path(suffix=""):
+    """
+    Export filename keyed on the model identity, so switching MODEL_DIR or NUM_LABELS
+    (or updating a local checkpoint) never reuses a stale graph.
+    """
+    identity = f"{MODEL_DIR}|{NUM_LABELS}"
+    if os.path.isdir(MODEL_DIR):
+        identity += "|" + str(max(
+            (entry.stat().st_mtime_ns for entry in os.scandir(MODEL_DIR) if entry.is_file()),
+            default=0,
+        ))
+    digest = hashlib.sha1(identity.encode()).hexdigest()[:12]
+    return f"bert_wsd-{digest}{suffix}.onnx"
+
+def write_atomically(path, write):
+    """Run write(tmp_path) and move the result into place, so a crash never leaves a truncated file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_bert(dtype):
+    """BERT pair classifier from MODEL_DIR, in eval mode on the CPU."""
+    # SDPA attention dispatches to fused flash / memory-efficient kernels
+    model = BertForSequenceClassification.from_pretrained(
+        MODEL_DIR, num_labels=NUM_LABELS, ignore_mismatched_sizes=True, attn_implementation="sdpa",
+        low_cpu_mem_usage=True, torch_dtype=dtype
+    )
+    return model.eval()
+
+def build_onnx_session(tokenizer, n_threads):
+    """Export the model to ONNX (first run only) and open a fused ONNX Runtime session."""
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    onnx_path = onnx_export_path()
+    if not os.path.exists(onnx_path):
+        # The torch weights are only needed, in fp32, to write the graph once
+        model = load_bert(torch.float32)
+        dummy = tokenizer("sentence", "gloss", return_tensors="pt")
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+        write_atomically(onnx_path, lambda tmp_path: torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in input_names),
+            tmp_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        ))
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if device.type == "cuda":
+        return ort.InferenceSession(
+            onnx_path, options, providers=["CUDAExecutionProvider", "CPUExecutionProvider"]
+        )
 
-    .section-divider {
-        border-top: 2px solid #e5e7eb;
-        margin: 20px 0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # CPU: dynamic INT8 quantization of the exported graph, same thread budget as torch
+    int8_path = onnx_export_path(".int8")
+    if not os.path.exists(int8_path):
+        write_atomically(int8_path, lambda tmp_path: quantize_onnx_dynamic(
+            onnx_path, tmp_path, weight_type=QuantType.QInt8
+        ))
+    options.intra_op_num_threads = n_threads
+    options.inter_op_num_threads = 1
+    return ort.InferenceSession(int8_path, options, providers=["CPUExecutionProvider"])
+
+def configure_cpu_threads():
+    """
+    Pin intra-op threads to half the vCPUs so BERT does not oversubscribe Streamlit's threads.
+    Idempotent: it runs on every rerun (clearing st.cache_resource must not re-trigger
+    set_num_interop_threads, which raises once it has been set).
+    """
+    n_threads = max(1, (os.cpu_count() or 2) // 2)
+    if torch.get_num_threads() != n_threads:
+        torch.set_num_threads(n_threads)
+    if torch.get_num_interop_threads() != 1:
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # Already fixed for this process once inter-op work has started
+    return n_threads
 
-# ---------------- LOAD MODEL ----------------
 @st.cache_resource
-def load_model():
+def load_model(n_threads):
     tokenizer = BertTokenizerFast.from_pretrained(MODEL_DIR)
-    # Use num_labels=2 for binary classification (match/no-match)
-    model = BertForSequenceClassification.from_pretrained(MODEL_DIR, num_labels=2, ignore_mismatched_sizes=True)
-    model.to(device)
-    model.eval()
-    return tokenizer, model
+    if BACKEND == "onnx":
+        return tokenizer, None, build_onnx_session(tokenizer, n_threads)
+
+    # Half precision on GPU runs the matmuls on tensor cores
+    model = load_bert(torch.float16 if device.type == "cuda" else torch.float32).to(device)
+    if device.type == "cuda":
+        torch.cuda.set_per_process_memory_fraction(CUDA_MEMORY_FRACTION, device)
+        # Fuse the forward with TorchInductor; dynamic shapes for dynamic padding
+        model = torch.compile(model, dynamic=True)
+    else:
+        # Dynamic INT8 quantization of the Linear layers for CPU inference
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return tokenizer, model, None
 
-tokenizer, model = load_model()
+n_threads = configure_cpu_threads() if device.type == "cpu" else None
+tokenizer, model, onnx_session = load_model(n_threads)
 
 # ---------------- UTILS ----------------
+_NONALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_NONWORD_RE = re.compile(r"[^\w]")
+_NONALPHA_RE = re.compile(r"[^a-z]")
+
+# Words that should NOT form compound terms (auxiliary verbs, articles, etc.)
+_SKIP_WORDS = frozenset({
+    'will', 'would', 'could', 'should', 'can', 'may', 'might', 'must',
+    'do', 'does', 'did', 'has', 'have', 'had', 'is', 'are', 'was', 'were',
+    'the', 'a', 'an', 'to', 'and', 'or', 'but', 'for', 'with', 'at', 'by',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'my', 'your', 'his', 'her',
+    'this', 'that', 'these', 'those', 'some', 'any', 'all', 'each', 'every'
+})
+
+# Known compound types - find_compound_term ONLY returns compounds from this set
+_KNOWN_COMPOUNDS = frozenset({
+    'blood bank', 'food bank', 'river bank', 'memory bank',
+    'apple tree', 'apple pie', 'apple juice',
+    'cell phone', 'prison cell', 'blood cell',
+    'light bulb', 'traffic light', 'flash light',
+    'book store', 'book shelf', 'comic book',
+    'smart watch', 'pocket watch', 'stop watch',
+    'wrist watch', 'night watch'
+})
+
 def simple_tokenize(text):
-    text = re.sub(r"[^a-z0-9\s]", " ", text.lower())
+    text = _NONALNUM_RE.sub(" ", text.lower())
     return text.split()
 
-def extract_words_only(sentence):
+def extract_words_only(tokens):
     words = []
-    tokens = sentence.split()
     for i, token in enumerate(tokens):
-        clean_word = re.sub(r'[^\w]', '', token)
+        clean_word = _NONWORD_RE.sub('', token)
         if clean_word:
             words.append((i, clean_word, token))
     return words
 
-def knowledge_score(context_tokens, synset):
+@dataclass(frozen=True)
+class ParsedSentence:
+    """One tokenization pass over a sentence, shared by every helper in a script run."""
+    raw_tokens: tuple          # Whitespace tokens as typed
+    lower_tokens: tuple        # raw_tokens lowercased
+    clean_words: tuple         # (index, clean_word, raw_token) for tokens with word characters
+    word_to_index: dict        # Lowercased raw token -> index of its first occurrence
+    context_tokens: frozenset  # simple_tokenize() output used for knowledge scoring
+
+# cache_resource: ParsedSentence is defined in the script, so it cannot round-trip through pickle
+@st.cache_resource(max_entries=512, show_spinner=False)
+def parse_sentence(sentence):
+    raw_tokens = tuple(sentence.split())
+    lower_tokens = tuple(token.lower() for token in raw_tokens)
+    word_to_index = {}
+    for i, token in enumerate(lower_tokens):
+        word_to_index.setdefault(token, i)
+    return ParsedSentence(
+        raw_tokens=raw_tokens,
+        lower_tokens=lower_tokens,
+        clean_words=tuple(extract_words_only(raw_tokens)),
+        word_to_index=word_to_index,
+        context_tokens=frozenset(simple_tokenize(sentence)),
+    )
+
+@st.cache_resource(max_entries=50000, show_spinner=False)
+def _gloss_ids(synset_name):
+    """Word-piece ids of a synset's definition, without special tokens."""
+    definition = wn.synset(synset_name).definition()
+    return tuple(tokenizer(definition, add_special_tokens=False)["input_ids"])
+
+def encode_pairs(sentence, gloss_id_lists):
+    """
+    Build a [CLS] sentence [SEP] gloss [SEP] batch from pre-tokenized glosses.
+    Rows are right-padded to the longest pair and capped at MAX_LEN tokens.
+    """
+    budget = MAX_LEN - 3  # room left after [CLS] and two [SEP]
+    sent_ids = tokenizer(sentence, add_special_tokens=False)["input_ids"][:budget]
+    pairs = []
+    for gloss_ids in gloss_id_lists:
+        # Keep at least half the budget for the gloss when both sides are long
+        gloss = list(gloss_ids[:max(budget - len(sent_ids), budget // 2)])
+        pairs.append((sent_ids[:budget - len(gloss)], gloss))
+
+    width = max(len(sent) + len(gloss) + 3 for sent, gloss in pairs)
+    input_ids, attention_mask, token_type_ids = [], [], []
+    for sent, gloss in pairs:
+        ids = [tokenizer.cls_token_id] + sent + [tokenizer.sep_token_id] + gloss + [tokenizer.sep_token_id]
+        pad = width - len(ids)
+        input_ids.append(ids + [tokenizer.pad_token_id] * pad)
+        attention_mask.append([1] * len(ids) + [0] * pad)
+        token_type_ids.append([0] * (len(sent) + 2) + [1] * (len(gloss) + 1) + [0] * pad)
+    return {
+        "input_ids": torch.tensor(input_ids),
+        "attention_mask": torch.tensor(attention_mask),
+        "token_type_ids": torch.tensor(token_type_ids),
+    }
+
+def bert_match_probs(enc):
+    """Probability of the positive (match) class for each encoded (sentence, gloss) pair."""
+    if onnx_session is not None:
+        logits = onnx_session.run(["logits"], {k: v.numpy() for k, v in enc.items()})[0]
+        logits = torch.from_numpy(logits)
+    else:
+        # Pinned host buffers let the host-to-device copies run asynchronously
+        pinned = device.type == "cuda"
+        enc = {k: (v.pin_memory() if pinned else v).to(device, non_blocking=pinned) for k, v in enc.items()}
+        with torch.inference_mode():
+            logits = model(**enc).logits
+    # Use softmax for 2-label output, take probability of positive class
+    probs = torch.softmax(logits.float(), dim=1)[:, 1]
+    # Single device-to-host transfer (and sync) for the whole batch
+    return probs.cpu().tolist()
+
+@st.cache_resource(max_entries=8192, show_spinner=False)
+def _synsets(word):
+    """WordNet senses of a word, looked up once per process."""
+    return tuple(wn.synsets(word.lower()))
+
+# cache_resource (not lru_cache) so the cache survives Streamlit script reruns
+@st.cache_resource(max_entries=50000, show_spinner=False)
+def _synset_gloss_tokens(synset_name):
+    """Token set of a synset's gloss, examples and first two hypernym glosses."""
+    synset = wn.synset(synset_name)
     gloss = synset.definition()
     examples = " ".join(synset.examples())
     text = gloss + " " + examples
     for hyp in synset.hypernyms()[:2]:
         text += " " + hyp.definition()
-    gloss_tokens = simple_tokenize(text)
-    if not gloss_tokens:
+    return frozenset(simple_tokenize(text))
+
+def release_cuda_cache():
+    """Hand cached CUDA blocks back to the driver only when the allocator holds too much."""
+    total = torch.cuda.get_device_properties(device).total_memory
+    if torch.cuda.memory_reserved(device) > CUDA_EMPTY_CACHE_FRACTION * total:
+        torch.cuda.empty_cache()
+
+def knowledge_score(context_tokens, synset):
+    gloss_set = _synset_gloss_tokens(synset.name())
+    if not gloss_set:
         return 0.0
-    return len(set(context_tokens) & set(gloss_tokens))
+    return len(context_tokens & gloss_set)
 
-def is_likely_named_entity(word, sentence):
+def is_likely_named_entity(word, parsed):
     """Check if word is likely a named entity (capitalized, not at start)."""
     # Check if word is capitalized in the original sentence
-    tokens = sentence.split()
-    for i, token in enumerate(tokens):
-        clean = re.sub(r'[^\w]', '', token)
-        if clean.lower() == word.lower():
+    word_lower = word.lower()
+    n_tokens = len(parsed.raw_tokens)
+    for i, clean, token in parsed.clean_words:
+        if clean.lower() == word_lower:
             # Check capitalization (not just first word)
-            if token[0].isupper() and (i > 0 or len(tokens) > 1):
+            if token[0].isupper() and (i > 0 or n_tokens > 1):
                 return True
     return False
 
-def get_wikipedia_context(word, sentence):
+@st.cache_data(max_entries=512, ttl=3600, show_spinner=False)
+def get_wikipedia_context(word, sentence, _parsed):
     """
     Get Wikipedia context for any word, with compound term detection.
     Detects phrases like 'blood bank', 'apple tree', etc.
@@ -491,41 +619,38 @@ def get_wikipedia_context(word, sentence):
     if not WIKIPEDIA_AVAILABLE:
         return None
     
-    try:
-        # Try to find compound terms (e.g., "blood bank", "apple tree")
-        compound_term = find_compound_term(word, sentence)
-        search_term = compound_term if compound_term else word
-        
-        # Pass sentence context for better disambiguation
-        summary = get_wikipedia_summary(search_term, context=sentence)
-        if summary:
-            return {
-                "summary": summary,
-                "search_term": search_term,
-                "is_compound": compound_term is not None,
-                "word": word
-            }
-    except Exception as e:
-        pass
-    return None
+    # Try to find compound terms (e.g., "blood bank", "apple tree")
+    compound_term = find_compound_term(word, _parsed)
+    search_term = compound_term if compound_term else word
+    
+    # Pass sentence context for better disambiguation
+    summary = get_wikipedia_summary(search_term, context=sentence)
+    if not summary:
+        # A None summary may be a transient fetch failure, so raise rather than let
+        # st.cache_data keep it; genuine misses are cached by wikipedia_knowledge
+        raise LookupError(f"No Wikipedia summary for {search_term!r}")
+    return {
+        "summary": summary,
+        "search_term": search_term,
+        "is_compound": compound_term is not None,
+        "word": word
+    }
 
 
-def find_compound_term(word, sentence):
+def find_compound_term(word, parsed):
     """
     Find if the word is part of a compound term in the sentence.
     E.g., 'bank' in 'blood bank operates...' -> 'blood bank'
     Only returns compounds from the known list to avoid false positives.
     """
     # Common compound patterns to look for
-    words = sentence.lower().split()
+    words = parsed.lower_tokens
     word_lower = word.lower()
     
     # Find position of target word
-    try:
-        idx = words.index(word_lower)
-    except ValueError:
+    idx = parsed.word_to_index.get(word_lower, -1)
+    if idx == -1:
         # Try partial match
-        idx = -1
         for i, w in enumerate(words):
             if word_lower in w:
                 idx = i
@@ -533,44 +658,29 @@ def find_compound_term(word, sentence):
         if idx == -1:
             return None
     
-    # Words that should NOT form compound terms (auxiliary verbs, articles, etc.)
-    skip_words = {
-        'will', 'would', 'could', 'should', 'can', 'may', 'might', 'must',
-        'do', 'does', 'did', 'has', 'have', 'had', 'is', 'are', 'was', 'were',
-        'the', 'a', 'an', 'to', 'and', 'or', 'but', 'for', 'with', 'at', 'by',
-        'i', 'you', 'he', 'she', 'it', 'we', 'they', 'my', 'your', 'his', 'her',
-        'this', 'that', 'these', 'those', 'some', 'any', 'all', 'each', 'every'
-    }
-    
     # Check for compound term (word before + target word)
     if idx > 0:
-        prev_word = re.sub(r'[^a-z]', '', words[idx - 1])
+        prev_word = _NONALPHA_RE.sub('', words[idx - 1])
         
         # Skip if previous word is an auxiliary or common function word
-        if prev_word in skip_words:
+        if prev_word in _SKIP_WORDS:
             return None
             
         compound = f"{prev_word} {word_lower}"
-        
-        # List of known compound types - ONLY return compounds from this list
-        known_compounds = [
-            'blood bank', 'food bank', 'river bank', 'memory bank',
-            'apple tree', 'apple pie', 'apple juice',
-            'cell phone', 'prison cell', 'blood cell',
-            'light bulb', 'traffic light', 'flash light',
-            'book store', 'book shelf', 'comic book',
-            'smart watch', 'pocket watch', 'stop watch',
-            'wrist watch', 'night watch'
-        ]
-        
-        if compound in known_compounds:
+        if compound in _KNOWN_COMPOUNDS:
             return compound
     
     return None
 
-def hybrid_predict(sentence, target_word):
-    ctx_tokens = simple_tokenize(sentence)
-    candidates = wn.synsets(target_word.lower())
+@st.cache_data(max_entries=512, ttl=3600, show_spinner=False)
+def hybrid_predict(sentence, target_word, _parsed):
+    """
+    Rank WordNet senses of target_word in sentence.
+    Returns synset names (not Synset objects) so results can be cached:
+    (best_name, [(hybrid, synset_name, kb, nn), ...])
+    """
+    ctx_tokens = _parsed.context_tokens
+    candidates = _synsets(target_word)
     
     if not candidates:
         return None, []
@@ -582,25 +692,18 @@ def hybrid_predict(sentence, target_word):
     top_idx = sorted_idx[:TOP_K]
     norm_kb = [(kb_scores[i] / (max_kb + 1e-6)) for i in top_idx]
 
-    bert_scores = []
-    with torch.no_grad():
-        for idx in top_idx:
-            gloss = candidates[idx].definition()
-            enc = tokenizer(sentence, gloss, truncation=True, max_length=MAX_LEN, padding="max_length", return_tensors="pt")
-            enc = {k: v.to(device) for k,v in enc.items()}
-            out = model(**enc)
-            # Use softmax for 2-label output, take probability of positive class
-            prob = torch.softmax(out.logits, dim=1)[0, 1].item()
-            bert_scores.append(prob)
+    # Score all candidate glosses in a single batched forward pass
+    gloss_ids = [_gloss_ids(candidates[i].name()) for i in top_idx]
+    bert_scores = bert_match_probs(encode_pairs(sentence, gloss_ids))
 
     combined = []
     for kb, nn, i_idx in zip(norm_kb, bert_scores, top_idx):
         hybrid = ALPHA * nn + (1 - ALPHA) * kb
-        combined.append((hybrid, candidates[i_idx], kb, nn))
+        combined.append((hybrid, candidates[i_idx].name(), kb, nn))
 
     combined.sort(key=lambda x: x[0], reverse=True)
-    best = combined[0][1]
-    return best, combined
+    best_name = combined[0][1]
+    return best_name, combined
 
 # ---------------- UI LAYOUT ----------------
 
@@ -610,8 +713,7 @@ with col1:
     st.markdown('<h1 class="main-title">Word Sense Disambiguation</h1>', unsafe_allow_html=True)
 with col2:
     st.markdown('<div style="height: 2.5rem;"></div>', unsafe_allow_html=True)  # Spacer for vertical alignment
-    theme_label = "Light Mode" if st.session_state.dark_mode else "Dark Mode"
-    st.button(theme_label, on_click=toggle_theme, key="theme_toggle")
+    components.html(THEME_TOGGLE_HTML, height=60)
 
 st.markdown('<p class="subtitle">Enter a sentence and select a word to discover its meaning in context</p>', unsafe_allow_html=True)
 
@@ -623,7 +725,8 @@ default_sentence = "I went to the bank to deposit money."
 sentence = st.text_area("sentence_input", value=default_sentence, height=100, label_visibility="collapsed")
 
 if sentence.strip():
-    words_data = extract_words_only(sentence)
+    parsed = parse_sentence(sentence)
+    words_data = parsed.clean_words
     
     if words_data:
         st.markdown("### Select a word to analyze:")
@@ -640,7 +743,7 @@ if sentence.strip():
         target_original_idx = words_data[selected_idx][0]
         
         st.markdown("### Your sentence:")
-        tokens = sentence.split()
+        tokens = parsed.raw_tokens
         highlighted_html = ""
         for i, token in enumerate(tokens):
             if i == target_original_idx:
@@ -654,7 +757,11 @@ if sentence.strip():
         
         if st.button("Analyze Meaning"):
             with st.spinner("Analyzing..."):
-                best, candidates = hybrid_predict(sentence, target_word)
+                best_name, ranked = hybrid_predict(sentence, target_word, parsed)
+                if device.type == "cuda":
+                    release_cuda_cache()
+                best = wn.synset(best_name) if best_name else None
+                candidates = [(score, wn.synset(name), kb, nn) for score, name, kb, nn in ranked]
             
             st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
             
@@ -662,7 +769,10 @@ if sentence.strip():
                 st.error("No word senses found for this word.")
             else:
                 # ALWAYS fetch Wikipedia context (not just for named entities)
-                wiki_context = get_wikipedia_context(target_word, sentence)
+                try:
+                    wiki_context = get_wikipedia_context(target_word, sentence, parsed)
+                except Exception:
+                    wiki_context = None
                 
                 # Show Wikipedia context if found
                 if wiki_context:
@@ -674,7 +784,7 @@ if sentence.strip():
                     
                     if is_compound:
                         header_text = f"📖 Compound Term: {search_display}"
-                    elif is_likely_named_entity(target_word, sentence):
+                    elif is_likely_named_entity(target_word, parsed):
                         header_text = f"🏢 Named Entity: {search_display}"
                     else:
                         header_text = f"📖 Wikipedia: {search_display}"
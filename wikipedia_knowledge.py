@@ -7,16 +7,71 @@ Fetches article summaries and calculates knowledge overlap scores.
 
 import re
 import os
+import sys
 import json
 import hashlib
+import functools
+import threading
 import requests
-from typing import Optional, Dict, List, Tuple
-from func_timeout import func_timeout, FunctionTimedOut
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List, NamedTuple, Tuple
+
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# JSON decoder for API responses and cache files (both accept bytes)
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
 
 # Cache directory for Wikipedia results
 CACHE_DIR = "./wiki_cache"
 os.makedirs(CACHE_DIR, exist_ok=True)
 
+# Concurrent requests used by batch_prefetch_wikipedia (kept modest for API etiquette)
+PREFETCH_WORKERS = 8
+
+# get_enriched_gloss skips Wikipedia when the WordNet definition and examples
+# already share this many content words with the context
+WIKI_SKIP_THRESHOLD = 3
+
+# Shared HTTP session: keeps connections alive and, when requests_cache is
+# installed, deduplicates raw API calls in an on-disk SQLite cache.
+if REQUESTS_CACHE_AVAILABLE:
+    _SESSION = requests_cache.CachedSession(
+        os.path.join(CACHE_DIR, "http_cache"), backend="sqlite", expire_after=86400
+    )
+else:
+    _SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'WSDHybridModel/1.0 (viranchpatel@example.com)'
+})
+# Pool sized for concurrent prefetch workers; one quick retry for transient errors.
+# Retry-After is ignored so a 429 cannot stall a caller past the 2s request timeout.
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16, pool_maxsize=32,
+    max_retries=Retry(
+        total=1, backoff_factor=0.1, status_forcelist=(429, 502, 503, 504),
+        respect_retry_after_header=False,
+    ),
+))
+
 def _cache_key(word: str) -> str:
     """Generate cache key for a word."""
     return hashlib.md5(word.lower().strip().encode()).hexdigest()
@@ -26,8 +81,8 @@ def _load_cache(word: str) -> Optional[Dict]:
     cache_file = os.path.join(CACHE_DIR, f"{_cache_key(word)}.json")
     if os.path.exists(cache_file):
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(cache_file, 'rb') as f:
+                return _loads(f.read())
         except:
             pass
     return None
@@ -35,18 +90,25 @@ def _load_cache(word: str) -> Optional[Dict]:
 def _save_cache(word: str, data: Dict):
     """Save Wikipedia result to cache."""
     cache_file = os.path.join(CACHE_DIR, f"{_cache_key(word)}.json")
+    # Write to a private temp file and rename it into place, so a concurrent
+    # writer or reader never sees a half-written JSON file
+    tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(cache_file, 'w', encoding='utf-8') as f:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
     except:
-        pass
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
 
 # ============================================================================
 # CONTEXT DETECTION - For disambiguating words based on sentence context
 # ============================================================================
 
 # Keywords that indicate programming/coding context
-PROGRAMMING_KEYWORDS = [
+PROGRAMMING_KEYWORDS = frozenset([
     'code', 'coding', 'programming', 'program', 'software', 'developer', 'development',
     'function', 'method', 'variable', 'loop', 'syntax', 'compile', 'compiler',
     'script', 'scripting', 'debug', 'debugging', 'algorithm', 'data structure',
@@ -62,34 +124,34 @@ PROGRAMMING_KEYWORDS = [
     'if statement', 'for loop', 'while loop', 'switch', 'case', 'break',
     'selenium', 'pytest', 'unittest', 'django', 'flask', 'react', 'angular', 'vue',
     'tensorflow', 'pytorch', 'pandas', 'numpy', 'scipy', 'matplotlib'
-]
+])
 
 # Keywords that indicate tech company context (tech-specific, not generic business)
-TECH_COMPANY_KEYWORDS = [
+TECH_COMPANY_KEYWORDS = frozenset([
     'launched', 'iphone', 'ipad', 'macbook', 'airpods', 'apple watch',
     'google', 'microsoft', 'amazon prime', 'facebook', 'meta', 'twitter',
     'samsung', 'tesla', 'spacex', 'nvidia', 'intel', 'amd',
     'android', 'ios', 'windows', 'macos', 'chromebook', 'pixel',
     'silicon valley', 'tech giant', 'big tech', 'trillion dollar',
     'tim cook', 'elon musk', 'mark zuckerberg', 'sundar pichai', 'satya nadella'
-]
+])
 
 # Keywords that indicate biology/nature context
-BIOLOGY_KEYWORDS = [
+BIOLOGY_KEYWORDS = frozenset([
     'animal', 'species', 'habitat', 'wildlife', 'zoo', 'nature', 'ecosystem',
     'reptile', 'mammal', 'bird', 'insect', 'snake', 'predator', 'prey',
     'forest', 'jungle', 'wild', 'bite', 'venom', 'scales', 'tail', 'burrow'
-]
+])
 
 # Keywords that indicate finance/banking context
-FINANCE_KEYWORDS = [
+FINANCE_KEYWORDS = frozenset([
     'money', 'deposit', 'withdraw', 'savings', 'account', 'loan', 'interest',
     'mortgage', 'credit', 'debit', 'transaction', 'balance', 'atm', 'bank account',
     'financial', 'investment', 'stocks', 'bonds', 'portfolio'
-]
+])
 
 # Keywords that indicate food/eating context
-FOOD_KEYWORDS = [
+FOOD_KEYWORDS = frozenset([
     'ate', 'eat', 'eating', 'food', 'fruit', 'vegetable', 'delicious', 'tasty',
     'cook', 'cooking', 'recipe', 'meal', 'breakfast', 'lunch', 'dinner', 'snack',
     'hungry', 'bite', 'chew', 'swallow', 'taste', 'flavor', 'sweet', 'sour',
@@ -97,10 +159,10 @@ FOOD_KEYWORDS = [
     'pie', 'salad', 'dessert', 'bake', 'baking', 'kitchen', 'plate', 'bowl',
     'orchard', 'farm', 'harvest', 'grow',
     'seed', 'skin', 'peel', 'slice', 'chop', 'blend', 'smoothie'
-]
+])
 
 # Keywords that indicate entertainment/viewing context
-ENTERTAINMENT_KEYWORDS = [
+ENTERTAINMENT_KEYWORDS = frozenset([
     'tv', 'television', 'movie', 'film', 'show', 'series', 'episode', 'channel',
     'netflix', 'youtube', 'stream', 'streaming', 'video', 'cinema', 'theater',
     'broadcast', 'programme', 'program', 'documentary', 'news', 'sports',
@@ -109,18 +171,18 @@ ENTERTAINMENT_KEYWORDS = [
     'actor', 'actress', 'director', 'starring', 'cast', 'scene', 'plot',
     'comedy', 'drama', 'thriller', 'horror', 'action', 'romance', 'cartoon',
     'anime', 'sitcom', 'reality', 'game show', 'talk show', 'late night'
-]
+])
 
 # Keywords that indicate timepiece/clock context
-TIMEPIECE_KEYWORDS = [
+TIMEPIECE_KEYWORDS = frozenset([
     'wrist', 'wristwatch', 'clock', 'time', 'hour', 'minute', 'second',
     'digital', 'analog', 'strap', 'band', 'dial', 'face', 'hands',
     'wearing', 'wore', 'timer', 'stopwatch', 'alarm', 'bezel',
     'luxury', 'rolex', 'casio', 'seiko', 'omega', 'jewelry', 'accessory'
-]
+])
 
 # Keywords that indicate observation/surveillance/guarding context
-OBSERVATION_KEYWORDS = [
+OBSERVATION_KEYWORDS = frozenset([
     'guard', 'security', 'monitor', 'monitoring', 'surveillance', 'patrol',
     'building', 'house', 'property', 'premises', 'door', 'entrance', 'gate',
     'protect', 'protection', 'keep an eye', 'lookout', 'alert', 'careful',
@@ -129,10 +191,10 @@ OBSERVATION_KEYWORDS = [
     'child', 'children', 'kids', 'baby', 'toddler', 'babysit', 'babysitting',
     'pet', 'dog', 'cat', 'prisoner', 'suspect', 'criminal',
     'night shift', 'duty', 'post', 'station', 'sentry', 'vigilant'
-]
+])
 
 # Keywords that indicate fitness/exercise/sports context
-FITNESS_KEYWORDS = [
+FITNESS_KEYWORDS = frozenset([
     'morning', 'jog', 'jogging', 'exercise', 'workout', 'marathon', 'sprint',
     'gym', 'fitness', 'athletic', 'athlete', 'training', 'cardio', 'aerobic',
     'mile', 'kilometer', 'distance', 'race', 'racing', 'track', 'field',
@@ -140,10 +202,10 @@ FITNESS_KEYWORDS = [
     'healthy', 'health', 'sweat', 'stamina', 'endurance', 'pace', 'speed',
     'treadmill', 'outdoor', 'park', 'trail', 'route', 'lap', 'finish line',
     'goes for', 'went for', 'take a', 'daily', 'routine', 'regularly'
-]
+])
 
 # Keywords that indicate business/management/organization context
-BUSINESS_KEYWORDS = [
+BUSINESS_KEYWORDS = frozenset([
     'successfully', 'manager', 'managing', 'management', 'ceo', 'director',
     'led', 'lead', 'leading', 'founder', 'founded', 'owner', 'ownership',
     'organization', 'organisation', 'corporation', 'enterprise', 'firm',
@@ -151,30 +213,30 @@ BUSINESS_KEYWORDS = [
     'profit', 'revenue', 'growth', 'expand', 'expansion', 'strategy',
     'board', 'executive', 'operations', 'administered', 'oversaw',
     'headed', 'supervised', 'controlled', 'governed', 'steered'
-]
+])
 
 # Keywords that indicate emotion/physical sensation context
-EMOTION_KEYWORDS = [
+EMOTION_KEYWORDS = frozenset([
     'tears', 'tear', 'crying', 'cry', 'sob', 'sobbing', 'weep', 'weeping',
     'cheek', 'cheeks', 'emotion', 'emotional',
     'sad', 'sadness', 'happy', 'happiness', 'joy', 'grief', 'sorrow',
     'pain', 'hurt', 'heartbreak', 'heartbroken', 'moved', 'touched',
     'down her', 'down his', 'down my', 'down the', 'began to', 'started to',
     'flow', 'flowing', 'drip', 'dripping', 'trickle'
-]
+])
 
 # Keywords that indicate computer/digital context
-COMPUTER_KEYWORDS = [
+COMPUTER_KEYWORDS = frozenset([
     'upload', 'download', 'document', 'folder', 'directory', 'save', 'open',
     'click', 'drag', 'drop', 'attach', 'attachment', 'email', 'send',
     'computer', 'laptop', 'desktop', 'storage', 'disk', 'drive', 'usb',
     'pdf', 'word', 'excel', 'image', 'photo', 'video', 'audio', 'mp3', 'mp4',
     'zip', 'compress', 'extract', 'rename', 'delete', 'copy', 'paste',
     'share', 'transfer', 'submit', 'format', 'extension'
-]
+])
 
 # Keywords that indicate legal/court context
-LEGAL_KEYWORDS = [
+LEGAL_KEYWORDS = frozenset([
     'lawyer', 'attorney', 'court', 'judge', 'trial', 'case', 'lawsuit',
     'legal', 'law', 'filed', 'filing', 'petition', 'motion', 'hearing',
     'plaintiff', 'defendant', 'prosecution', 'defense', 'verdict', 'judgment',
@@ -182,633 +244,768 @@ LEGAL_KEYWORDS = [
     'litigation', 'settlement', 'damages', 'claim', 'complaint', 'injunction',
     'magistrate', 'barrister', 'solicitor', 'paralegal', 'notary', 'oath',
     'police', 'thief', 'arrest', 'arrested', 'crime', 'criminal', 'accused', 'suspect'
-]
+])
 
 # Keywords that indicate tools/crafts/manufacturing context
-TOOLS_KEYWORDS = [
+TOOLS_KEYWORDS = frozenset([
     'wood', 'smooth', 'smoothen', 'smoothened', 'grind', 'grinding',
     'sand', 'sanding', 'polish', 'polishing', 'shape', 'shaping', 'sharpen',
     'workshop', 'workbench', 'tool', 'tools', 'hand tool', 'rasp', 'chisel',
     'carpenter', 'carpentry', 'metalwork', 'blacksmith', 'forge', 'craft',
     'edge', 'edges', 'rough', 'surface', 'material', 'iron', 'steel', 'brass',
     'nail', 'screw', 'bolt'
-]
+])
 
 # Keywords that indicate season/time of year context
-SEASON_KEYWORDS = [
+SEASON_KEYWORDS = frozenset([
     'flowers', 'flower', 'bloom', 'blooming', 'blossom', 'blossoming',
     'summer', 'autumn', 'fall', 'winter', 'seasonal', 'season',
     'weather', 'warm', 'cold', 'sunny', 'rainy', 'temperature',
     'months', 'march', 'april', 'may', 'june', 'september', 'october',
     'garden', 'gardening', 'planting', 'seeds', 'nature', 'trees',
     'birds', 'butterflies', 'allergies', 'pollen', 'year'
-]
+])
 
 # Keywords that indicate water/hydrology context
-WATER_KEYWORDS = [
+WATER_KEYWORDS = frozenset([
     'water', 'flows', 'flow', 'flowing', 'river', 'stream', 'creek',
     'lake', 'pond', 'well', 'underground', 'aquifer', 'source',
     'drink', 'drinking', 'fresh', 'mineral', 'natural', 'bubbling',
     'fountain', 'hot springs', 'thermal', 'geothermal', 'geyser',
     'bottle', 'bottled', 'pure', 'clean', 'clear'
-]
+])
 
 # Keywords that indicate mechanical/device context
-MECHANICAL_KEYWORDS = [
+MECHANICAL_KEYWORDS = frozenset([
     'toy', 'toys', 'coil', 'bounce', 'bouncing', 'elastic',
     'mechanism', 'mechanical', 'device', 'mattress', 'bed',
     'suspension', 'shock absorber', 'tension', 'compress',
     'compressed', 'stretch', 'stretched', 'force', 'pressure', 'push', 'pull',
     'jump', 'jumping', 'trampoline', 'pen', 'button', 'loaded'
-]
+])
 
 # Keywords that indicate construction/machinery context
-CONSTRUCTION_KEYWORDS = [
+CONSTRUCTION_KEYWORDS = frozenset([
     'lifted', 'lifting', 'lift', 'heavy', 'load', 'loading', 'container', 'containers',
     'construction', 'site', 'building', 'tower', 'tall', 'height',
     'equipment', 'machinery', 'operator', 'hoist', 'hook', 'cable', 'wire',
     'cargo', 'shipyard', 'port', 'dock', 'warehouse', 'factory',
     'move', 'moving', 'transport', 'haul', 'weight', 'tons', 'industrial'
-]
+])
 
 # Keywords that indicate bird/wildlife context
-BIRD_KEYWORDS = [
+BIRD_KEYWORDS = frozenset([
     'flew', 'fly', 'flying', 'flight', 'wings', 'wing', 'feathers', 'feather',
     'nest', 'nesting', 'eggs', 'beak', 'migrate', 'migration', 'migratory',
     'lake', 'pond', 'wetland', 'marsh', 'swamp', 'habitat',
     'bird', 'birds', 'avian', 'flock', 'soar', 'soaring', 'glide', 'graceful',
     'wildlife', 'nature', 'sanctuary', 'endangered', 'species'
-]
+])
 
 # Keywords that indicate electrical/battery context
-ELECTRICAL_KEYWORDS = [
+ELECTRICAL_KEYWORDS = frozenset([
     'phone', 'battery', 'batteries', 'plug', 'plugged', 'charger', 'charging',
     'power', 'electric', 'electrical', 'outlet', 'socket', 'usb', 'cable',
     'laptop', 'device', 'wireless', 'adapter', 'volt', 'voltage', 'amp',
     'dead', 'low', 'full', 'percentage', 'rechargeable', 'lithium'
-]
+])
 
 # Keywords that indicate payment/cost context
-PAYMENT_KEYWORDS = [
+PAYMENT_KEYWORDS = frozenset([
     'service', 'fee', 'fees', 'cost', 'price', 'pay', 'payment', 'free',
     'no charge', 'extra', 'additional', 'bill', 'invoice', 'receipt',
     'discount', 'rate', 'flat rate', 'per hour', 'monthly', 'annual',
     'subscription', 'membership', 'premium', 'basic', 'refund'
-]
+])
 
 # Keywords that indicate military/attack context
-MILITARY_KEYWORDS = [
+MILITARY_KEYWORDS = frozenset([
     'soldiers', 'soldier', 'army', 'troops', 'military', 'battle', 'war',
     'forward', 'attack', 'attacking', 'advance', 'advancing', 'rush', 'rushing',
     'enemy', 'combat', 'fight', 'fighting', 'battlefield', 'front line',
     'cavalry', 'infantry', 'retreat', 'assault', 'offensive', 'defense',
     'began to', 'started to', 'ordered to', 'commanded'
-]
+])
 
 # Keywords that indicate writing/message context
-WRITING_KEYWORDS = [
+WRITING_KEYWORDS = frozenset([
     'wrote', 'write', 'writing', 'written', 'letter', 'message', 'memo',
     'paper', 'pen', 'pencil', 'jot', 'jotted', 'scribble', 'scribbled',
     'sticky', 'post-it', 'reminder', 'journal', 'diary', 'notebook',
     'left a', 'leave a', 'send a', 'passed a', 'handed a', 'read a'
-]
+])
 
 # Keywords that indicate music/sound context
-MUSIC_KEYWORDS = [
+MUSIC_KEYWORDS = frozenset([
     'musical', 'music', 'song', 'songs', 'melody', 'tune',
     'sing', 'singing', 'sang', 'instrument',
     'piano', 'guitar', 'violin', 'flute', 'orchestra', 'choir',
     'high note', 'low note', 'flat note', 'sharp note', 'scale', 'octave',
     'sound', 'sounds', 'tone', 'tones', 'frequency', 'high pitch', 'low pitch'
-]
+])
 
 # Keywords that indicate education/school context
-EDUCATION_KEYWORDS = [
+EDUCATION_KEYWORDS = frozenset([
     'math', 'mathematics', 'science', 'history', 'english', 'physics', 'chemistry',
     'biology', 'geography', 'economics', 'literature', 'school', 'college', 'university',
     'teacher', 'professor', 'student', 'students', 'classroom', 'lecture', 'lesson',
     'exam', 'test', 'homework', 'assignment', 'grade', 'grades', 'semester', 'course'
-]
+])
 
 # Keywords that indicate currency/money context
-CURRENCY_KEYWORDS = [
+CURRENCY_KEYWORDS = frozenset([
     '₹', 'rupee', 'rupees', 'dollar', 'dollars', '$', 'euro', 'euros', '€',
     'pound', 'pounds', '£', 'yen', '¥', 'cash', 'money', 'currency',
     'banknote', 'bill', 'bills', '100', '500', '1000', '2000', '50', '20',
     'gave me', 'handed me', 'paid', 'change', 'wallet', 'pocket', 'purse'
-]
+])
 
 # Keywords that indicate industrial/factory context
-INDUSTRIAL_KEYWORDS = [
+INDUSTRIAL_KEYWORDS = frozenset([
     'factory', 'factories', 'power', 'manufacturing', 'production', 'assembly',
     'nuclear', 'thermal', 'electricity', 'generator', 'turbine', 'energy',
     'industrial', 'industry', 'processing', 'refinery', 'chemical', 'steel',
     'cement', 'textile', 'automobile', 'machinery', 'facility', 'facilities'
-]
+])
 
 # Keywords that indicate botany/vegetation context
-BOTANY_KEYWORDS = [
+BOTANY_KEYWORDS = frozenset([
     'watered', 'water', 'watering', 'grow', 'growing', 'grew', 'growth',
     'flower', 'flowers', 'flowering', 'leaf', 'leaves', 'root', 'roots',
     'soil', 'pot', 'potted', 'garden', 'gardening', 'greenhouse', 'sunlight',
     'seed', 'seeds', 'stem', 'branch', 'branches', 'tree', 'trees', 'shrub',
     'green', 'vegetation', 'photosynthesis', 'fertilizer', 'indoor', 'outdoor'
-]
+])
 
 # Keywords that indicate spy/undercover context
-SPY_KEYWORDS = [
+SPY_KEYWORDS = frozenset([
     'spy', 'spies', 'spying', 'undercover', 'secret', 'secrets', 'agent',
     'infiltrate', 'infiltrated', 'infiltration', 'mole', 'double agent',
     'insider', 'informant', 'informer', 'traitor', 'betrayal',
     'organization', 'gang', 'cartel', 'intelligence', 'cia', 'fbi',
     'mission', 'covert', 'operation', 'surveillance', 'planted'
-]
+])
 
 # Keywords that indicate sports/athletics context
-SPORTS_KEYWORDS = [
+SPORTS_KEYWORDS = frozenset([
     'ball', 'balls', 'pitched', 'throw', 'throwing', 'threw', 'catch', 'catching',
     'baseball', 'cricket', 'bowling', 'bowled', 'batter', 'batsman', 'wicket',
     'game', 'games', 'match', 'matches', 'player', 'players', 'team', 'teams',
     'stadium', 'field', 'innings', 'score', 'runs', 'home run', 'strike', 'out',
     'sport', 'sports', 'athletic', 'athlete', 'coach', 'practice'
-]
+])
 
 # Keywords that indicate sales/business presentation context
-SALES_KEYWORDS = [
+SALES_KEYWORDS = frozenset([
     'sales', 'impressive', 'presentation', 'client', 'clients', 'customer', 'customers',
     'business', 'deal', 'deals', 'proposal', 'marketing', 'advertising', 'product',
     'convince', 'persuade', 'meeting', 'investor', 'investors', 'startup', 'venture',
     'elevator pitch', 'shark tank', 'funding', 'investment', 'sell', 'selling'
-]
+])
 
 # Keywords that indicate terrain/ground context
-TERRAIN_KEYWORDS = [
+TERRAIN_KEYWORDS = frozenset([
     'tent', 'tents', 'flat', 'ground', 'camping', 'camp', 'campsite',
     'set up', 'setup', 'level', 'even', 'uneven', 'slope', 'sloped',
     'grass', 'grassy', 'outdoor', 'outdoors', 'terrain', 'surface',
     'football pitch', 'soccer pitch', 'cricket pitch', 'playing field'
-]
+])
 
 # Keywords that indicate social class/hierarchy context
-SOCIAL_KEYWORDS = [
+SOCIAL_KEYWORDS = frozenset([
     'upper class', 'lower class', 'middle class', 'working class', 'upper', 'lower',
     'wealthy', 'rich', 'poor', 'poverty', 'elite', 'aristocrat', 'aristocracy',
     'noble', 'nobility', 'royal', 'royalty', 'commoner', 'peasant', 'bourgeois',
     'status', 'hierarchy', 'society', 'belongs to', 'born into', 'privilege'
-]
+])
 
 # Keywords that indicate insect/creature context
-INSECT_KEYWORDS = [
+INSECT_KEYWORDS = frozenset([
     'crawling', 'crawl', 'crawled', 'wall', 'floor', 'ceiling', 'window',
     'ant', 'ants', 'spider', 'spiders', 'beetle', 'cockroach', 'fly', 'flies',
     'mosquito', 'butterfly', 'moth', 'insect', 'insects', 'pest', 'pests',
     'legs', 'wings', 'antenna', 'bite', 'bitten', 'sting', 'stung', 'squash'
-]
+])
 
 # Keywords that indicate surveillance/spy device context
-SURVEILLANCE_KEYWORDS = [
+SURVEILLANCE_KEYWORDS = frozenset([
     'hidden', 'microphone', 'wiretap', 'listening', 'recording', 'secretly',
     'planted', 'device', 'spy', 'spying', 'surveillance', 'eavesdrop', 'tap',
     'room', 'office', 'phone', 'conversation', 'detected', 'sweep', 'found'
-]
+])
 
 # Keywords that indicate fashion/modeling context
-FASHION_KEYWORDS = [
+FASHION_KEYWORDS = frozenset([
     'fashion', 'runway', 'ramp', 'photoshoot', 'photo shoot', 'photographer',
     'pose', 'posing', 'beautiful', 'gorgeous', 'supermodel', 'catwalk',
     'magazine', 'vogue', 'designer', 'modeling', 'modelling', 'agency',
     'portfolio', 'commercial', 'advertisement', 'ad', 'campaign'
-]
+])
 
 # Keywords that indicate product/vehicle context
-PRODUCT_KEYWORDS = [
+PRODUCT_KEYWORDS = frozenset([
     'car', 'cars', 'vehicle', 'vehicles', 'automobile', 'bike', 'motorcycle',
     'new model', 'latest', 'version', 'year', 'brand', 'make', 'manufacturer',
     'features', 'specs', 'specifications', 'engine', 'horsepower', 'mileage',
     'release', 'launched', 'introduced', 'upgraded', 'improved', 'design'
-]
+])
+
+
+class ContextCategory(NamedTuple):
+    """A context type, its keywords, and its bit in keyword category bitmasks."""
+    name: str
+    keywords: frozenset
+    bit: int
+
+
+# Context types in tie-break order: on equal scores the earlier entry wins
+CONTEXT_CATEGORIES: Tuple[ContextCategory, ...] = tuple(
+    ContextCategory(name, keywords, 1 << i)
+    for i, (name, keywords) in enumerate((
+        ('programming', PROGRAMMING_KEYWORDS),
+        ('tech_company', TECH_COMPANY_KEYWORDS),
+        ('biology', BIOLOGY_KEYWORDS),
+        ('finance', FINANCE_KEYWORDS),
+        ('food', FOOD_KEYWORDS),
+        ('entertainment', ENTERTAINMENT_KEYWORDS),
+        ('timepiece', TIMEPIECE_KEYWORDS),
+        ('observation', OBSERVATION_KEYWORDS),
+        ('fitness', FITNESS_KEYWORDS),
+        ('business', BUSINESS_KEYWORDS),
+        ('emotion', EMOTION_KEYWORDS),
+        ('computer', COMPUTER_KEYWORDS),
+        ('legal', LEGAL_KEYWORDS),
+        ('tools', TOOLS_KEYWORDS),
+        ('season', SEASON_KEYWORDS),
+        ('water', WATER_KEYWORDS),
+        ('mechanical', MECHANICAL_KEYWORDS),
+        ('construction', CONSTRUCTION_KEYWORDS),
+        ('bird', BIRD_KEYWORDS),
+        ('electrical', ELECTRICAL_KEYWORDS),
+        ('payment', PAYMENT_KEYWORDS),
+        ('military', MILITARY_KEYWORDS),
+        ('writing', WRITING_KEYWORDS),
+        ('music', MUSIC_KEYWORDS),
+        ('currency', CURRENCY_KEYWORDS),
+        ('industrial', INDUSTRIAL_KEYWORDS),
+        ('botany', BOTANY_KEYWORDS),
+        ('spy', SPY_KEYWORDS),
+        ('sports', SPORTS_KEYWORDS),
+        ('sales', SALES_KEYWORDS),
+        ('terrain', TERRAIN_KEYWORDS),
+        ('social', SOCIAL_KEYWORDS),
+        ('education', EDUCATION_KEYWORDS),
+        ('insect', INSECT_KEYWORDS),
+        ('surveillance', SURVEILLANCE_KEYWORDS),
+        ('fashion', FASHION_KEYWORDS),
+        ('product', PRODUCT_KEYWORDS),
+    ))
+)
+
+@functools.lru_cache(maxsize=None)
+def _keyword_index():
+    """
+    Build the keyword lookup structures on first use.
+    Returns (keyword -> category bitmask, keyword id -> category bitmask,
+    automaton or None, first character -> ((keyword, bitmask), ...)).
+    Bit i of a bitmask is CONTEXT_CATEGORIES[i]; keywords listed under several
+    context types share one entry, so each is stored and matched only once.
+    """
+    keyword_to_cats: Dict[str, int] = {}
+    for category in CONTEXT_CATEGORIES:
+        for kw in category.keywords:
+            kw = sys.intern(kw.lower())
+            keyword_to_cats[kw] = keyword_to_cats.get(kw, 0) | category.bit
+    
+    # One Aho-Corasick automaton over every keyword: a single pass over the
+    # sentence finds all (possibly overlapping) keyword occurrences and
+    # reports them as integer keyword ids.
+    automaton = None
+    by_first_char: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton(ahocorasick.STORE_INTS)
+        for kid, kw in enumerate(keyword_to_cats):
+            automaton.add_word(kw, kid)
+        automaton.make_automaton()
+    else:
+        # Fallback prefilter: only keywords whose first character occurs in
+        # the text can match, so bucket them by that character.
+        for kw, mask in keyword_to_cats.items():
+            by_first_char[kw[0]] = by_first_char.get(kw[0], ()) + ((kw, mask),)
+    
+    return keyword_to_cats, tuple(keyword_to_cats.values()), automaton, by_first_char
+
+
+def __getattr__(name: str):
+    # KEYWORD_TO_CATS is built lazily so importing the module stays cheap
+    if name == 'KEYWORD_TO_CATS':
+        return _keyword_index()[0]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _category_scores(context_lower: str) -> List[int]:
+    """Count the distinct keywords of each context type (in CONTEXT_CATEGORIES order) that occur in the text."""
+    _, category_masks, automaton, by_first_char = _keyword_index()
+    scores = [0] * len(CONTEXT_CATEGORIES)
+    if automaton is not None:
+        matched = {kid for _, kid in automaton.iter(context_lower)}
+        masks = [category_masks[kid] for kid in matched]
+    else:
+        masks = [
+            mask
+            for ch in set(context_lower).intersection(by_first_char)
+            for kw, mask in by_first_char[ch]
+            if kw in context_lower
+        ]
+    for mask in masks:
+        while mask:
+            low = mask & -mask
+            scores[low.bit_length() - 1] += 1
+            mask ^= low
+    return scores
 
 
 
 
 # Mapping of ambiguous words to their context-specific Wikipedia search terms
-CONTEXT_SEARCH_MAPPINGS = {
-    'python': {
+_SEARCH_MAPPINGS_RAW = (
+    ('python', {
         'programming': ['Python (programming language)', 'Python programming'],
         'biology': ['Python (genus)', 'Pythonidae snake']
         # No default - use plain word if no context detected
-    },
-    'java': {
+    }),
+    ('java', {
         'programming': ['Java (programming language)', 'Java software platform'],
         'geography': ['Java', 'Java island']
         # No default - use plain word if no context detected
-    },
-    'watch': {
+    }),
+    ('watch', {
         'entertainment': ['Television', 'Watching television', 'Viewer (television)'],
         'observation': ['Observation', 'Surveillance', 'Security guard'],
         'timepiece': ['Watch', 'Wristwatch', 'Timepiece']
         # No default - context determines meaning
-    },
-    'run': {
+    }),
+    ('run', {
         'fitness': ['Running', 'Jogging', 'Exercise'],
         'programming': ['Execution (computing)', 'Run command', 'Computer program execution'],
         'business': ['Management', 'Business operations', 'Corporate governance'],
         'emotion': ['Crying', 'Tears', 'Weeping']
         # No default - context determines meaning
-    },
-    'ran': {
+    }),
+    ('ran', {
         'fitness': ['Running', 'Jogging', 'Exercise'],
         'programming': ['Execution (computing)', 'Run command', 'Computer program execution'],
         'business': ['Management', 'Business operations', 'Corporate governance'],
         'emotion': ['Crying', 'Tears', 'Weeping']
         # No default - context determines meaning
-    },
-    'company': {
+    }),
+    ('company', {
         'business': ['Company', 'Business organization', 'Corporation'],
         'tech_company': ['Technology company', 'Tech company']
         # No default - context determines meaning
-    },
-    'file': {
+    }),
+    ('file', {
         'computer': ['Computer file', 'Digital file', 'File (computing)'],
         'legal': ['Legal filing', 'Court filing', 'File (legal)'],
         'tools': ['File (tool)', 'Hand file', 'Metalworking file']
         # No default - context determines meaning
-    },
-    'mouse': {
+    }),
+    ('mouse', {
         'computer': ['Computer mouse', 'Mouse (computing)', 'Input device'],
         'biology': ['Mouse', 'House mouse', 'Mus musculus']
         # No default - context determines meaning
-    },
-    'spring': {
+    }),
+    ('spring', {
         'season': ['Spring (season)', 'Springtime', 'Spring season'],
         'water': ['Spring (hydrology)', 'Natural spring', 'Water spring'],
         'mechanical': ['Spring (device)', 'Coil spring', 'Mechanical spring']
         # No default - context determines meaning
-    },
-    'crane': {
+    }),
+    ('crane', {
         'construction': ['Crane (machine)', 'Construction crane', 'Tower crane'],
         'bird': ['Crane (bird)', 'Gruidae', 'Crane bird']
         # No default - context determines meaning
-    },
-    'charge': {
+    }),
+    ('charge', {
         'legal': ['Criminal charge', 'Legal charge', 'Indictment'],
         'electrical': ['Battery charging', 'Electric charge', 'Charging battery'],
         'payment': ['Fee', 'Service charge', 'Price'],
         'military': ['Charge (warfare)', 'Military charge', 'Cavalry charge']
         # No default - context determines meaning
-    },
-    'note': {
+    }),
+    ('note', {
         'writing': ['Note (typography)', 'Written note', 'Memorandum'],
         'music': ['Musical note', 'Note (music)', 'Pitch (music)'],
         'currency': ['Banknote', 'Currency note', 'Paper money']
         # No default - context determines meaning
-    },
-    'plant': {
+    }),
+    ('plant', {
         'industrial': ['Power plant', 'Industrial plant', 'Factory'],
         'botany': ['Plant', 'Flowering plant', 'Houseplant'],
         'spy': ['Sleeper agent', 'Undercover agent', 'Mole (espionage)']
         # No default - context determines meaning
-    },
-    'pitch': {
+    }),
+    ('pitch', {
         'sports': ['Pitch (baseball)', 'Pitching (baseball)', 'Bowling (cricket)'],
         'sales': ['Sales pitch', 'Elevator pitch', 'Business pitch'],
         'terrain': ['Pitch (sports field)', 'Football pitch', 'Playing field'],
         'music': ['Pitch (music)', 'Audio frequency', 'Sound pitch']
         # No default - context determines meaning
-    },
-    'class': {
+    }),
+    ('class', {
         'programming': ['Class (computer programming)', 'Object-oriented programming class'],
         'education': ['Class (education)', 'School class', 'Classroom'],
         'social': ['Social class', 'Class system', 'Social stratification']
         # No default - context determines meaning
-    },
-    'bug': {
-        'programming': ['Software bug', 'Bug (software)', 'Programming error'],
+    }),
+    ('bug', {
+        'programming': ['Software bug', 'Computer bug', 'Bug (software)', 'Programming error'],
         'insect': ['Insect', 'Bug (insect)', 'True bugs'],
-        'surveillance': ['Covert listening device', 'Wiretap', 'Surveillance device']
-        # No default - context determines meaning
-    },
-    'model': {
+        'biology': ['Insect', 'Bug (insect)'],
+        'surveillance': ['Covert listening device', 'Wiretap', 'Surveillance device'],
+        'default': ['Software bug']
+    }),
+    ('model', {
         'programming': ['Machine learning model', 'AI model', 'Statistical model'],
         'fashion': ['Model (person)', 'Fashion model', 'Supermodel'],
         'product': ['Model (product)', 'Product model', 'Vehicle model']
         # No default - context determines meaning
-    },
-    'object': {
+    }),
+    ('object', {
         'programming': ['Object (computer science)', 'Object-oriented programming'],
         'default': ['Object (computer science)']
-    },
-    'function': {
+    }),
+    ('function', {
         'programming': ['Function (computer programming)', 'Subroutine'],
         'math': ['Function (mathematics)'],
         'default': ['Function (computer programming)']
-    },
-    'method': {
+    }),
+    ('method', {
         'programming': ['Method (computer programming)', 'Object-oriented method'],
         'default': ['Method (computer programming)']
-    },
-    'variable': {
+    }),
+    ('variable', {
         'programming': ['Variable (computer science)', 'Programming variable'],
         'math': ['Variable (mathematics)'],
         'default': ['Variable (computer science)']
-    },
-    'string': {
+    }),
+    ('string', {
         'programming': ['String (computer science)', 'Character string'],
         'music': ['String instrument', 'Guitar string'],
         'default': ['String (computer science)']
-    },
-    'array': {
+    }),
+    ('array', {
         'programming': ['Array (data structure)', 'Array data type'],
         'default': ['Array (data structure)']
-    },
-    'loop': {
+    }),
+    ('loop', {
         'programming': ['Loop (programming)', 'Control flow loop'],
         'default': ['Loop (programming)']
-    },
-    'inheritance': {
+    }),
+    ('inheritance', {
         'programming': ['Inheritance (object-oriented programming)', 'OOP inheritance'],
         'default': ['Inheritance (object-oriented programming)']
-    },
-    'interface': {
+    }),
+    ('interface', {
         'programming': ['Interface (computing)', 'Protocol (object-oriented programming)'],
         'default': ['Interface (computing)']
-    },
-    'module': {
+    }),
+    ('module', {
         'programming': ['Module (programming)', 'Modular programming'],
         'default': ['Module (programming)']
-    },
-    'package': {
+    }),
+    ('package', {
         'programming': ['Package (programming)', 'Software package'],
         'default': ['Package (programming)']
-    },
-    'exception': {
+    }),
+    ('exception', {
         'programming': ['Exception handling', 'Exception (computer programming)'],
         'default': ['Exception handling']
-    },
-    'constructor': {
+    }),
+    ('constructor', {
         'programming': ['Constructor (object-oriented programming)', 'Class constructor'],
         'default': ['Constructor (object-oriented programming)']
-    },
-    'instance': {
+    }),
+    ('instance', {
         'programming': ['Instance (computer science)', 'Object instance'],
         'default': ['Instance (computer science)']
-    },
-    'pointer': {
+    }),
+    ('pointer', {
         'programming': ['Pointer (computer programming)', 'Memory pointer'],
         'default': ['Pointer (computer programming)']
-    },
-    'stack': {
+    }),
+    ('stack', {
         'programming': ['Stack (abstract data type)', 'Call stack'],
         'default': ['Stack (abstract data type)']
-    },
-    'queue': {
+    }),
+    ('queue', {
         'programming': ['Queue (abstract data type)', 'FIFO queue'],
         'default': ['Queue (abstract data type)']
-    },
-    'tree': {
+    }),
+    ('tree', {
         'programming': ['Tree (data structure)', 'Binary tree'],
         'biology': ['Tree', 'Woody plant'],
         'default': ['Tree (data structure)']
-    },
-    'node': {
+    }),
+    ('node', {
         'programming': ['Node (computer science)', 'Data structure node'],
         'default': ['Node (computer science)']
-    },
-    'graph': {
+    }),
+    ('graph', {
         'programming': ['Graph (abstract data type)', 'Graph theory'],
         'math': ['Graph (discrete mathematics)'],
         'default': ['Graph (abstract data type)']
-    },
-    'apple': {
+    }),
+    ('apple', {
         'tech_company': ['Apple Inc.', 'Apple (company)'],
         'food': ['Apple', 'Apple fruit'],
         'biology': ['Apple', 'Apple fruit']
         # No default - context determines meaning
-    },
-    'amazon': {
+    }),
+    ('amazon', {
         'tech_company': ['Amazon (company)', 'Amazon.com'],
         'geography': ['Amazon River', 'Amazon rainforest']
         # No default - context determines meaning
-    },
-    'oracle': {
+    }),
+    ('oracle', {
         'programming': ['Oracle Corporation', 'Oracle Database'],
         'default': ['Oracle Corporation']
-    },
-    'ruby': {
+    }),
+    ('ruby', {
         'programming': ['Ruby (programming language)'],
         'default': ['Ruby (programming language)']
-    },
-    'rust': {
+    }),
+    ('rust', {
         'programming': ['Rust (programming language)'],
         'default': ['Rust (programming language)']
-    },
-    'swift': {
+    }),
+    ('swift', {
         'programming': ['Swift (programming language)'],
         'default': ['Swift (programming language)']
-    },
-    'go': {
+    }),
+    ('go', {
         'programming': ['Go (programming language)'],
         'default': ['Go (programming language)']
-    },
-    'scala': {
+    }),
+    ('scala', {
         'programming': ['Scala (programming language)'],
         'default': ['Scala (programming language)']
-    },
-    'kotlin': {
+    }),
+    ('kotlin', {
         'programming': ['Kotlin (programming language)'],
         'default': ['Kotlin (programming language)']
-    },
-    'c': {
+    }),
+    ('c', {
         'programming': ['C (programming language)'],
         'default': ['C (programming language)']
-    },
-    'r': {
+    }),
+    ('r', {
         'programming': ['R (programming language)'],
         'default': ['R (programming language)']
-    },
-    'dart': {
+    }),
+    ('dart', {
         'programming': ['Dart (programming language)'],
         'default': ['Dart (programming language)']
-    },
-    'shell': {
+    }),
+    ('shell', {
         'programming': ['Shell (computing)', 'Unix shell', 'Command-line interface'],
         'biology': ['Shell (biology)', 'Seashell'],
         'default': ['Shell (computing)']
-    },
-    'bash': {
+    }),
+    ('bash', {
         'programming': ['Bash (Unix shell)', 'Bourne Again Shell'],
         'default': ['Bash (Unix shell)']
-    },
-    'script': {
+    }),
+    ('script', {
         'programming': ['Scripting language', 'Script (computing)'],
         'default': ['Scripting language']
-    },
-    'library': {
+    }),
+    ('library', {
         'programming': ['Library (computing)', 'Software library'],
         'default': ['Library (computing)']
-    },
-    'framework': {
+    }),
+    ('framework', {
         'programming': ['Software framework', 'Web framework'],
         'default': ['Software framework']
-    },
-    'compiler': {
+    }),
+    ('compiler', {
         'programming': ['Compiler', 'Source code compiler'],
         'default': ['Compiler']
-    },
-    'interpreter': {
+    }),
+    ('interpreter', {
         'programming': ['Interpreter (computing)', 'Programming interpreter'],
         'default': ['Interpreter (computing)']
-    },
-    'runtime': {
+    }),
+    ('runtime', {
         'programming': ['Runtime system', 'Runtime environment'],
         'default': ['Runtime system']
-    },
-    'thread': {
+    }),
+    ('thread', {
         'programming': ['Thread (computing)', 'Execution thread'],
         'default': ['Thread (computing)']
-    },
-    'process': {
+    }),
+    ('process', {
         'programming': ['Process (computing)', 'Computer process'],
         'default': ['Process (computing)']
-    },
-    'socket': {
+    }),
+    ('socket', {
         'programming': ['Network socket', 'Socket (computing)'],
         'default': ['Network socket']
-    },
-    'port': {
+    }),
+    ('port', {
         'programming': ['Port (computer networking)', 'Network port'],
         'default': ['Port (computer networking)']
-    },
-    'protocol': {
+    }),
+    ('protocol', {
         'programming': ['Communications protocol', 'Network protocol'],
         'default': ['Communications protocol']
-    },
-    'api': {
+    }),
+    ('api', {
         'programming': ['API', 'Application programming interface'],
         'default': ['API']
-    },
-    'sdk': {
+    }),
+    ('sdk', {
         'programming': ['Software development kit', 'SDK'],
         'default': ['Software development kit']
-    },
-    'ide': {
+    }),
+    ('ide', {
         'programming': ['Integrated development environment', 'IDE'],
         'default': ['Integrated development environment']
-    },
-    'bug': {
-        'programming': ['Software bug', 'Computer bug'],
-        'biology': ['Insect', 'Bug (insect)'],
-        'default': ['Software bug']
-    },
-    'patch': {
+    }),
+    ('patch', {
         'programming': ['Patch (computing)', 'Software patch'],
         'default': ['Patch (computing)']
-    },
-    'branch': {
+    }),
+    ('branch', {
         'programming': ['Branching (version control)', 'Git branch'],
         'biology': ['Branch (botany)', 'Tree branch'],
         'default': ['Branching (version control)']
-    },
-    'merge': {
+    }),
+    ('merge', {
         'programming': ['Merge (version control)', 'Git merge'],
         'default': ['Merge (version control)']
-    },
-    'commit': {
+    }),
+    ('commit', {
         'programming': ['Commit (version control)', 'Git commit'],
         'default': ['Commit (version control)']
-    },
-    'repository': {
+    }),
+    ('repository', {
         'programming': ['Repository (version control)', 'Software repository'],
         'default': ['Repository (version control)']
-    },
-    'container': {
+    }),
+    ('container', {
         'programming': ['Container (computing)', 'Docker container', 'OS-level virtualization'],
         'default': ['Container (computing)']
-    },
-    'docker': {
+    }),
+    ('docker', {
         'programming': ['Docker (software)', 'Docker container platform'],
         'default': ['Docker (software)']
-    },
-    'kubernetes': {
+    }),
+    ('kubernetes', {
         'programming': ['Kubernetes', 'Container orchestration'],
         'default': ['Kubernetes']
-    },
-    'cloud': {
+    }),
+    ('cloud', {
         'programming': ['Cloud computing', 'Cloud infrastructure'],
         'default': ['Cloud computing']
-    },
-    'lambda': {
+    }),
+    ('lambda', {
         'programming': ['Anonymous function', 'Lambda calculus', 'AWS Lambda'],
         'default': ['Anonymous function']
-    },
-    'expression': {
+    }),
+    ('expression', {
         'programming': ['Expression (computer science)', 'Programming expression'],
         'default': ['Expression (computer science)']
-    },
-    'statement': {
+    }),
+    ('statement', {
         'programming': ['Statement (computer science)', 'Programming statement'],
         'default': ['Statement (computer science)']
-    },
-    'operator': {
+    }),
+    ('operator', {
         'programming': ['Operator (computer programming)', 'Programming operator'],
         'default': ['Operator (computer programming)']
-    },
-    'type': {
+    }),
+    ('type', {
         'programming': ['Data type', 'Type system'],
         'default': ['Data type']
-    },
-    'casting': {
+    }),
+    ('casting', {
         'programming': ['Type conversion', 'Type casting'],
         'default': ['Type conversion']
-    },
-    'abstract': {
+    }),
+    ('abstract', {
         'programming': ['Abstract type', 'Abstraction (computer science)'],
         'default': ['Abstract type']
-    },
-    'static': {
+    }),
+    ('static', {
         'programming': ['Static variable', 'Static method'],
         'default': ['Static variable']
-    },
-    'dynamic': {
+    }),
+    ('dynamic', {
         'programming': ['Dynamic typing', 'Dynamic programming language'],
         'default': ['Dynamic typing']
-    },
-    'private': {
+    }),
+    ('private', {
         'programming': ['Access modifier', 'Private member'],
         'default': ['Access modifier']
-    },
-    'public': {
+    }),
+    ('public', {
         'programming': ['Access modifier', 'Public member'],
         'default': ['Access modifier']
-    },
-    'protected': {
+    }),
+    ('protected', {
         'programming': ['Access modifier', 'Protected member'],
         'default': ['Access modifier']
-    },
-    'final': {
+    }),
+    ('final', {
         'programming': ['Final (Java)', 'Constant (programming)'],
         'default': ['Final (Java)']
-    },
-    'const': {
+    }),
+    ('const', {
         'programming': ['Constant (programming)', 'Const keyword'],
         'default': ['Constant (programming)']
-    },
-    'void': {
+    }),
+    ('void', {
         'programming': ['Void type', 'Void (programming)'],
         'default': ['Void type']
-    },
-    'null': {
+    }),
+    ('null', {
         'programming': ['Null pointer', 'Null (programming)'],
         'default': ['Null pointer']
-    },
-    'bank': {
+    }),
+    ('bank', {
         'finance': ['Bank', 'Financial institution'],
         'geography': ['River bank', 'Stream bank'],
         'default': ['Bank']
-    }
+    }),
+)
+
+CONTEXT_SEARCH_MAPPINGS: Dict[str, Dict[str, List[str]]] = {}
+for _word, _mappings in _SEARCH_MAPPINGS_RAW:
+    # A dict literal would silently keep only the last duplicate; fail loudly instead
+    if _word in CONTEXT_SEARCH_MAPPINGS:
+        raise AssertionError(f"duplicate CONTEXT_SEARCH_MAPPINGS entry: {_word!r}")
+    CONTEXT_SEARCH_MAPPINGS[_word] = _mappings
+
+# (word, context type) -> search terms, flattened from CONTEXT_SEARCH_MAPPINGS
+# so resolving a word's terms is a single dict lookup. Titles are interned:
+# many recur across words and contexts, and they double as cache keys.
+# Equal term lists are hash-consed into one shared tuple.
+_TERM_POOL: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_SEARCH_TERMS: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+for _word, _mappings in CONTEXT_SEARCH_MAPPINGS.items():
+    for _context_type, _terms in _mappings.items():
+        _terms = tuple(map(sys.intern, _terms))
+        _SEARCH_TERMS[(_word, _context_type)] = _TERM_POOL.setdefault(_terms, _terms)
+
+# Generic search term templates for words without a specific mapping
+_GENERIC_SEARCH_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    'programming': ("{} (programming)", "{} (computer science)", "{} (computing)", "{}"),
+    'tech_company': ("{} Inc.", "{} (company)", "{}"),
 }
 
 
+@functools.lru_cache(maxsize=8192)
 def _detect_context_type(context_lower: str) -> str:
     """
     Detect the context type based on keywords in the sentence.
@@ -818,130 +1015,64 @@ def _detect_context_type(context_lower: str) -> str:
         return ''
     
     # Calculate scores for each context type
-    programming_score = sum(1 for kw in PROGRAMMING_KEYWORDS if kw in context_lower)
-    tech_company_score = sum(1 for kw in TECH_COMPANY_KEYWORDS if kw in context_lower)
-    biology_score = sum(1 for kw in BIOLOGY_KEYWORDS if kw in context_lower)
-    finance_score = sum(1 for kw in FINANCE_KEYWORDS if kw in context_lower)
-    food_score = sum(1 for kw in FOOD_KEYWORDS if kw in context_lower)
-    entertainment_score = sum(1 for kw in ENTERTAINMENT_KEYWORDS if kw in context_lower)
-    timepiece_score = sum(1 for kw in TIMEPIECE_KEYWORDS if kw in context_lower)
-    observation_score = sum(1 for kw in OBSERVATION_KEYWORDS if kw in context_lower)
-    fitness_score = sum(1 for kw in FITNESS_KEYWORDS if kw in context_lower)
-    business_score = sum(1 for kw in BUSINESS_KEYWORDS if kw in context_lower)
-    emotion_score = sum(1 for kw in EMOTION_KEYWORDS if kw in context_lower)
-    computer_score = sum(1 for kw in COMPUTER_KEYWORDS if kw in context_lower)
-    legal_score = sum(1 for kw in LEGAL_KEYWORDS if kw in context_lower)
-    tools_score = sum(1 for kw in TOOLS_KEYWORDS if kw in context_lower)
-    season_score = sum(1 for kw in SEASON_KEYWORDS if kw in context_lower)
-    water_score = sum(1 for kw in WATER_KEYWORDS if kw in context_lower)
-    mechanical_score = sum(1 for kw in MECHANICAL_KEYWORDS if kw in context_lower)
-    construction_score = sum(1 for kw in CONSTRUCTION_KEYWORDS if kw in context_lower)
-    bird_score = sum(1 for kw in BIRD_KEYWORDS if kw in context_lower)
-    electrical_score = sum(1 for kw in ELECTRICAL_KEYWORDS if kw in context_lower)
-    payment_score = sum(1 for kw in PAYMENT_KEYWORDS if kw in context_lower)
-    military_score = sum(1 for kw in MILITARY_KEYWORDS if kw in context_lower)
-    writing_score = sum(1 for kw in WRITING_KEYWORDS if kw in context_lower)
-    music_score = sum(1 for kw in MUSIC_KEYWORDS if kw in context_lower)
-    currency_score = sum(1 for kw in CURRENCY_KEYWORDS if kw in context_lower)
-    industrial_score = sum(1 for kw in INDUSTRIAL_KEYWORDS if kw in context_lower)
-    botany_score = sum(1 for kw in BOTANY_KEYWORDS if kw in context_lower)
-    spy_score = sum(1 for kw in SPY_KEYWORDS if kw in context_lower)
-    sports_score = sum(1 for kw in SPORTS_KEYWORDS if kw in context_lower)
-    sales_score = sum(1 for kw in SALES_KEYWORDS if kw in context_lower)
-    terrain_score = sum(1 for kw in TERRAIN_KEYWORDS if kw in context_lower)
-    social_score = sum(1 for kw in SOCIAL_KEYWORDS if kw in context_lower)
-    education_score = sum(1 for kw in EDUCATION_KEYWORDS if kw in context_lower)
-    insect_score = sum(1 for kw in INSECT_KEYWORDS if kw in context_lower)
-    surveillance_score = sum(1 for kw in SURVEILLANCE_KEYWORDS if kw in context_lower)
-    fashion_score = sum(1 for kw in FASHION_KEYWORDS if kw in context_lower)
-    product_score = sum(1 for kw in PRODUCT_KEYWORDS if kw in context_lower)
+    scores = _category_scores(context_lower)
     
-    # Return the highest scoring context
-    scores = [
-        (programming_score, 'programming'),
-        (tech_company_score, 'tech_company'),
-        (biology_score, 'biology'),
-        (finance_score, 'finance'),
-        (food_score, 'food'),
-        (entertainment_score, 'entertainment'),
-        (timepiece_score, 'timepiece'),
-        (observation_score, 'observation'),
-        (fitness_score, 'fitness'),
-        (business_score, 'business'),
-        (emotion_score, 'emotion'),
-        (computer_score, 'computer'),
-        (legal_score, 'legal'),
-        (tools_score, 'tools'),
-        (season_score, 'season'),
-        (water_score, 'water'),
-        (mechanical_score, 'mechanical'),
-        (construction_score, 'construction'),
-        (bird_score, 'bird'),
-        (electrical_score, 'electrical'),
-        (payment_score, 'payment'),
-        (military_score, 'military'),
-        (writing_score, 'writing'),
-        (music_score, 'music'),
-        (currency_score, 'currency'),
-        (industrial_score, 'industrial'),
-        (botany_score, 'botany'),
-        (spy_score, 'spy'),
-        (sports_score, 'sports'),
-        (sales_score, 'sales'),
-        (terrain_score, 'terrain'),
-        (social_score, 'social'),
-        (education_score, 'education'),
-        (insect_score, 'insect'),
-        (surveillance_score, 'surveillance'),
-        (fashion_score, 'fashion'),
-        (product_score, 'product')
-    ]
+    # Return the highest scoring context (max() keeps the first on ties)
+    best = max(range(len(scores)), key=scores.__getitem__)
     
-    best_score, best_context = max(scores, key=lambda x: x[0])
-    
-    if best_score > 0:
-        return best_context
+    if scores[best] > 0:
+        return CONTEXT_CATEGORIES[best].name
     return ''
 
 
-def _build_context_aware_search_terms(word: str, context_lower: str) -> List[str]:
+def _build_context_aware_search_terms(word: str, context_lower: str,
+                                      context_type: Optional[str] = None) -> List[str]:
     """
     Build Wikipedia search terms based on word and context.
     Returns a list of search terms ordered by relevance.
+    Pass context_type when the caller has already detected it.
     """
     word_lower = word.lower().strip()
-    context_type = _detect_context_type(context_lower)
+    if context_type is None:
+        context_type = _detect_context_type(context_lower)
     
-    # Check if we have mappings for this word
-    if word_lower in CONTEXT_SEARCH_MAPPINGS:
-        mappings = CONTEXT_SEARCH_MAPPINGS[word_lower]
-        
-        # Try to get context-specific search terms
-        if context_type and context_type in mappings:
-            return mappings[context_type]
-        
-        # Fall back to default
-        if 'default' in mappings:
-            return mappings['default']
-    
-    # No specific mapping - build generic search terms based on context
-    if context_type == 'programming':
-        return [
-            f"{word} (programming)",
-            f"{word} (computer science)",
-            f"{word} (computing)",
-            word
-        ]
-    elif context_type == 'tech_company':
-        return [
-            f"{word} Inc.",
-            f"{word} (company)",
-            word
-        ]
+    # Context-specific search terms, falling back to the word's default
+    terms = _SEARCH_TERMS.get((word_lower, context_type))
+    if terms is None:
+        terms = _SEARCH_TERMS.get((word_lower, 'default'))
+    if terms is None:
+        terms = _generic_search_terms(word, context_type)
+    return list(terms)
+
+
+@functools.lru_cache(maxsize=4096)
+def _generic_search_terms(word: str, context_type: str) -> Tuple[str, ...]:
+    """Search terms for a word without a specific mapping, built from the context's templates."""
+    patterns = _GENERIC_SEARCH_PATTERNS.get(context_type)
+    if patterns is not None:
+        return tuple(pattern.format(word) for pattern in patterns)
     
     # Default - just use the word
-    return [word]
+    return (word,)
+
+
 
+# In-memory tier in front of the disk cache, keyed by
+# (word, detected context type, max_sentences) so that different sentences
+# resolving to the same context share one entry
+_SUMMARY_MEMO: "OrderedDict[Tuple[str, str, int], Optional[str]]" = OrderedDict()
+_SUMMARY_MEMO_SIZE = 10000
+_SUMMARY_MEMO_LOCK = threading.Lock()
+
+
+def _remember_summary(key: Tuple[str, str, int], summary: Optional[str]) -> Optional[str]:
+    """Store a summary (or a miss) in the in-memory LRU and return it."""
+    with _SUMMARY_MEMO_LOCK:
+        _SUMMARY_MEMO[key] = summary
+        _SUMMARY_MEMO.move_to_end(key)
+        if len(_SUMMARY_MEMO) > _SUMMARY_MEMO_SIZE:
+            _SUMMARY_MEMO.popitem(last=False)
+    return summary
 
 
 def get_wikipedia_summary(word: str, max_sentences: int = 3, context: str = None) -> Optional[str]:
@@ -954,92 +1085,96 @@ def get_wikipedia_summary(word: str, max_sentences: int = 3, context: str = None
     # Generate context-aware cache key
     cache_key_suffix = _detect_context_type(context_lower)
     cache_word = f"{word.lower()}_{cache_key_suffix}" if cache_key_suffix else word
+    memo_key = (word.lower().strip(), cache_key_suffix, max_sentences)
+    
+    # Check the in-memory tier, then the disk cache
+    with _SUMMARY_MEMO_LOCK:
+        if memo_key in _SUMMARY_MEMO:
+            _SUMMARY_MEMO.move_to_end(memo_key)
+            return _SUMMARY_MEMO[memo_key]
     
-    # Check cache first
     cached = _load_cache(cache_word)
     if cached is not None:
-        return cached.get('summary')
+        return _remember_summary(memo_key, cached.get('summary'))
     
     try:
         # Detect context type and build appropriate search terms
-        search_terms = _build_context_aware_search_terms(word, context_lower)
+        search_terms = _build_context_aware_search_terms(word, context_lower, cache_key_suffix)
         if not search_terms:
             search_terms = [word]
         
         summary = None
-        
-        # Requests session with strict timeout
-        session = requests.Session()
-        headers = {
-            'User-Agent': 'WSDHybridModel/1.0 (viranchpatel@example.com)'
-        }
+        failed = False
         
         for term in search_terms:
             try:
-                # 1. Search for the page
+                # Search for the page and fetch its intro extract in one request;
+                # exsentences trims the extract server-side
                 search_url = "https://en.wikipedia.org/w/api.php"
                 search_params = {
                     "action": "query",
                     "format": "json",
-                    "list": "search",
-                    "srsearch": term,
-                    "srlimit": 1
+                    "formatversion": 2,
+                    "generator": "search",
+                    "gsrsearch": term,
+                    "gsrlimit": 1,
+                    "prop": "extracts",
+                    "exintro": 1,
+                    "explaintext": 1,
+                    "exsentences": max_sentences
                 }
                 
                 # Strict 2 second timeout
-                resp = session.get(search_url, params=search_params, headers=headers, timeout=2.0)
-                data = resp.json()
+                resp = _SESSION.get(search_url, params=search_params, timeout=2.0)
+                resp.raise_for_status()
+                pages = _loads(resp.content).get("query", {}).get("pages")
                 
-                if not data.get("query", {}).get("search"):
+                if not pages:
                     continue
-                    
-                page_title = data["query"]["search"][0]["title"]
-                
-                # 2. Get the summary for the best match
-                summary_url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{page_title}"
-                summary_resp = session.get(summary_url, headers=headers, timeout=2.0)
                 
-                if summary_resp.status_code == 200:
-                    summary_data = summary_resp.json()
-                    extract = summary_data.get("extract")
-                    
-                    if extract:
-                        # Simple sentence splitting since we don't have nltk sentence splitter here 
-                        # or to be fast. Just take first few chars/sentences approx.
-                        sentences = extract.split('. ')
-                        summary = '. '.join(sentences[:max_sentences]) + '.'
-                        break
+                extract = pages[0].get("extract")
+                if extract:
+                    summary = extract
+                    break
             except Exception:
+                failed = True
                 continue
+        
+        # A term that errored might have matched, so only a clean miss is cached
+        if summary is None and failed:
+            return None
                 
         # Cache results with context-aware key
         _save_cache(cache_word, {'summary': summary})
-        return summary
+        return _remember_summary(memo_key, summary)
         
     except Exception as e:
         return None
 
+# Priority keywords for different contexts, matched as plain substrings
+_TECH_CONTEXT_RE = re.compile('|'.join(map(re.escape, [
+    'iphone', 'phone', 'computer', 'software', 'launched', 'released', 'app', 'device'
+])))
+_TECH_OPTION_RE = re.compile('company|inc|technology')
+
 
 def _find_best_disambiguation(options: List[str], word: str, context: str = None) -> str:
     """Find the best disambiguation option based on context."""
     context_lower = (context or "").lower()
-    
-    # Priority keywords for different contexts
-    tech_keywords = ['iphone', 'phone', 'computer', 'software', 'launched', 'released', 'app', 'device']
+    word_lower = word.lower()
     
     # Check if context suggests technology
-    is_tech = any(kw in context_lower for kw in tech_keywords)
+    is_tech = _TECH_CONTEXT_RE.search(context_lower) is not None
     
     for option in options:
         option_lower = option.lower()
         
         # For tech context, prefer company/technology options
-        if is_tech:
-            if 'company' in option_lower or 'inc' in option_lower or 'technology' in option_lower:
-                return option
+        if is_tech and _TECH_OPTION_RE.search(option_lower):
+            return option
         
         # Default: prefer the simplest option with the word
-        if word.lower() in option_lower and '(' not in option:
+        if word_lower in option_lower and '(' not in option:
             return option
     
     # Fallback to first option
@@ -1052,13 +1187,58 @@ def get_disambiguation_candidates(word: str) -> List[str]:
     Returns list of possible meanings/entities.
     """
     try:
-        wikipedia.set_lang("en")
-        wikipedia.page(word)
-        return [word]  # No disambiguation needed
-    except wikipedia.exceptions.DisambiguationError as e:
-        return e.options[:10] if e.options else []
-    except:
+        options = _disambiguation_candidates(word)
+    except (requests.RequestException, ValueError):
+        # Network or malformed-response failures are not cached, so a later call retries
         return []
+    # None means the page is not a disambiguation page, so the word stands for itself
+    return [word] if options is None else list(options)
+
+
+@functools.lru_cache(maxsize=8192)
+def _disambiguation_candidates(word: str) -> Optional[Tuple[str, ...]]:
+    """Disambiguation options for a word, memoized in memory and persisted in the disk cache.
+
+    Returns None for a page that is not a disambiguation page. The disk cache is
+    shared by every casing of the word, so nothing casing-specific is stored.
+    """
+    cache_word = f"disamb_{word.lower()}"
+    cached = _load_cache(cache_word)
+    if cached is not None:
+        if cached.get('disambiguation') is False:
+            return None
+        return tuple(cached.get('options', []))
+    
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "titles": word,
+        "redirects": 1,
+        "prop": "pageprops|links",
+        "ppprop": "disambiguation",
+        "plnamespace": 0,
+        "pllimit": 10
+    }
+    resp = _SESSION.get("https://en.wikipedia.org/w/api.php", params=params, timeout=2.0)
+    # Raise on HTTP and API errors so they reach the caller uncached, not as a stored []
+    resp.raise_for_status()
+    data = _loads(resp.content)
+    if "error" in data:
+        raise ValueError(f"MediaWiki API error: {data['error']}")
+    pages = data.get("query", {}).get("pages", [])
+    
+    if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+        options = []
+    elif "disambiguation" not in pages[0].get("pageprops", {}):
+        # No disambiguation needed
+        _save_cache(cache_word, {'disambiguation': False})
+        return None
+    else:
+        options = [link["title"] for link in pages[0].get("links", [])[:10]]
+    
+    _save_cache(cache_word, {'options': options})
+    return tuple(options)
 
 
 def get_wikipedia_context(word: str, synset_name: str) -> Optional[str]:
@@ -1073,9 +1253,26 @@ def get_wikipedia_context(word: str, synset_name: str) -> Optional[str]:
     return get_wikipedia_summary(base_word)
 
 
+# ASCII translation table: everything except a-z, 0-9 and whitespace becomes a space
+_TOKENIZE_TABLE = str.maketrans({
+    c: ' ' for c in map(chr, range(128))
+    if not (c.isspace() or 'a' <= c <= 'z' or '0' <= c <= '9')
+})
+_NON_TOKEN_RE = re.compile(r"[^a-z0-9\s]")
+
+
 def simple_tokenize(text: str) -> List[str]:
     """Tokenize text into lowercase words."""
-    return re.sub(r"[^a-z0-9\s]", " ", text.lower()).split()
+    text = text.lower()
+    if text.isascii():
+        return text.translate(_TOKENIZE_TABLE).split()
+    return _NON_TOKEN_RE.sub(" ", text).split()
+
+
+@functools.lru_cache(maxsize=4096)
+def _wiki_token_set(wiki_text: str) -> frozenset:
+    """Distinct tokens of a Wikipedia text, memoized since the same summary is scored repeatedly."""
+    return frozenset(simple_tokenize(wiki_text))
 
 
 def wikipedia_overlap_score(context_tokens: List[str], wiki_text: str) -> float:
@@ -1086,28 +1283,26 @@ def wikipedia_overlap_score(context_tokens: List[str], wiki_text: str) -> float:
     if not wiki_text:
         return 0.0
     
-    wiki_tokens = set(simple_tokenize(wiki_text))
+    wiki_tokens = _wiki_token_set(wiki_text)
     if not wiki_tokens:
         return 0.0
     
-    # Count overlapping tokens
-    overlap = len(set(context_tokens) & wiki_tokens)
+    # Count overlapping tokens (both calls accept any iterable, so a token
+    # list is not copied into a set first). isdisjoint() stops at the first
+    # shared token and allocates nothing, settling the common no-overlap case.
+    if wiki_tokens.isdisjoint(context_tokens):
+        return 0.0
+    overlap = len(wiki_tokens.intersection(context_tokens))
     
     # Normalize by context length to favor more comprehensive matches
     return overlap
 
 
-def get_enriched_gloss(word: str, synset, max_wiki_chars: int = 200) -> str:
+@functools.lru_cache(maxsize=65536)
+def _wordnet_gloss(synset) -> str:
     """
-    Create an enriched gloss combining WordNet and Wikipedia.
-    
-    Args:
-        word: The target word
-        synset: WordNet synset object
-        max_wiki_chars: Maximum characters from Wikipedia to include
-        
-    Returns:
-        Enriched gloss string
+    WordNet part of an enriched gloss: definition, examples and hypernym category.
+    Memoized per synset (synsets hash by name) so NLTK's lazy corpus reader is hit once each.
     """
     parts = []
     
@@ -1124,6 +1319,55 @@ def get_enriched_gloss(word: str, synset, max_wiki_chars: int = 200) -> str:
     if hypernyms:
         parts.append("Category: " + hypernyms[0].definition())
     
+    return " ".join(parts)
+
+
+# Function words that would otherwise let nearly any gloss pass WIKI_SKIP_THRESHOLD
+_OVERLAP_STOPWORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'of', 'to', 'in', 'on', 'at', 'by', 'for',
+    'with', 'from', 'into', 'onto', 'over', 'under', 'up', 'down', 'out', 'off', 'as',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'am', 'do', 'does', 'did',
+    'has', 'have', 'had', 'will', 'would', 'can', 'could', 'should', 'may', 'might',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
+    'my', 'your', 'his', 'its', 'our', 'their', 'this', 'that', 'these', 'those',
+    'there', 'here', 'who', 'which', 'what', 'when', 'where', 'how', 'not', 'no',
+    'so', 'if', 'than', 'then', 'too', 'very', 'some', 'any', 'all', 'each', 'one',
+    's', 't'
+})
+
+
+@functools.lru_cache(maxsize=65536)
+def _wordnet_content_tokens(synset) -> frozenset:
+    """Content words of a synset's definition and first two examples (no gloss labels)."""
+    text = " ".join([synset.definition(), *synset.examples()[:2]])
+    return frozenset(simple_tokenize(text)) - _OVERLAP_STOPWORDS
+
+
+def get_enriched_gloss(word: str, synset, max_wiki_chars: int = 200, context: Optional[str] = None) -> str:
+    """
+    Create an enriched gloss combining WordNet and Wikipedia.
+    
+    Args:
+        word: The target word
+        synset: WordNet synset object
+        max_wiki_chars: Maximum characters from Wikipedia to include
+        context: Optional sentence; if the WordNet definition and examples already
+            share WIKI_SKIP_THRESHOLD content words with it (stopwords and the
+            target word excluded), the Wikipedia lookup is skipped
+        
+    Returns:
+        Enriched gloss string
+    """
+    parts = [_wordnet_gloss(synset)]
+    
+    # WordNet alone is a strong enough match for this context: count shared
+    # content words, ignoring stopwords and the target word itself
+    if context:
+        context_tokens = set(simple_tokenize(context)) - _OVERLAP_STOPWORDS
+        context_tokens.difference_update(simple_tokenize(word))
+        if len(context_tokens & _wordnet_content_tokens(synset)) >= WIKI_SKIP_THRESHOLD:
+            return parts[0]
+    
     # Wikipedia context
     wiki_summary = get_wikipedia_summary(word)
     if wiki_summary:
@@ -1143,19 +1387,25 @@ def batch_prefetch_wikipedia(words: List[str], show_progress: bool = True):
     """
     from tqdm import tqdm
     
-    words_to_fetch = []
+    # List the cache directory once instead of probing a file per word
+    with os.scandir(CACHE_DIR) as entries:
+        cached = {entry.name[:-5] for entry in entries if entry.name.endswith('.json')}
+    # Dedupe on the cache key, since 'Bank' and 'bank ' share one cache file
+    unique_words: Dict[str, str] = {}
     for word in words:
-        if _load_cache(word) is None:
-            words_to_fetch.append(word)
+        unique_words.setdefault(_cache_key(word), word)
+    words_to_fetch = [word for key, word in unique_words.items() if key not in cached]
     
     if show_progress:
         print(f"Pre-fetching {len(words_to_fetch)} Wikipedia articles...")
-        iterator = tqdm(words_to_fetch, desc="Wikipedia")
-    else:
-        iterator = words_to_fetch
     
-    for word in iterator:
-        get_wikipedia_summary(word)
+    # Fetching is network-bound, so threads overlap the HTTP round trips
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as executor:
+        results = executor.map(get_wikipedia_summary, words_to_fetch)
+        if show_progress:
+            results = tqdm(results, total=len(words_to_fetch), desc="Wikipedia")
+        for _ in results:
+            pass
 
 
 if __name__ == "__main__":